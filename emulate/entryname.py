@@ -0,0 +1,108 @@
+"""
+Emulates the entry_name rules of https://en.wiktionary.org/wiki/Module:languages/data2 (and data3/...), which
+turn a term as it's written in a template into the title of its page, ie. plicō#Latin -> plico.
+See Module:languages#Language:makeEntryName, do_entry_name_or_sort_key_replacements()
+
+Module:languages' data isn't vendored here, so the rules for the langs we see most are copied below by hand.
+Each is compiled into one str.translate() table on first use:
+    remove_diacritics   combining marks to drop, after decomposing the word (NFD)
+    remove_exceptions   letters to keep whole, even though they decompose into one of those marks, ie. ć in Serbo-Croatian
+    from/to             characters to replace, ie. Arabic's alif wasla
+Etymology-only langs (ie. Vulgar Latin) use the rules of the lang they're a variety of, as on Wiktionary.
+Langs without any rules keep their words as is.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from langcode import codetable, langcodes
+
+# combining marks, named as in Module:languages
+GRAVE = "\u0300"
+ACUTE = "\u0301"
+TILDE = "\u0303"
+MACRON = "\u0304"
+BREVE = "\u0306"
+DOTABOVE = "\u0307"
+DIAER = "\u0308"
+DGRAVE = "\u030f"
+INVBREVE = "\u0311"
+DOUBLEINVBREVE = "\u0361"
+
+ARABIC_DIACRITICS = (
+    "".join(map(chr, range(0x064B, 0x0653))) + "\u0670\u0640"
+)  # harakat, superscript alif, tatweel
+HEBREW_POINTS = (
+    "".join(map(chr, range(0x0591, 0x05BE))) + "\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7"
+)  # cantillation and niqqud
+
+# code -> rule, in the shape of Module:languages' entry_name
+ENTRY_NAMES = {
+    "la": {"remove_diacritics": MACRON + BREVE + DIAER + DOUBLEINVBREVE},
+    "grc": {"remove_diacritics": MACRON + BREVE},
+    "el": {"remove_diacritics": MACRON + BREVE},
+    "ang": {"remove_diacritics": MACRON + DOTABOVE},
+    "ar": {"remove_diacritics": ARABIC_DIACRITICS, "from": "\u0671", "to": "\u0627"},
+    "fa": {"remove_diacritics": ARABIC_DIACRITICS, "from": "\u0671", "to": "\u0627"},
+    "he": {"remove_diacritics": HEBREW_POINTS},
+    "ru": {"remove_diacritics": GRAVE + ACUTE},
+    "uk": {"remove_diacritics": GRAVE + ACUTE},
+    "be": {"remove_diacritics": GRAVE + ACUTE},
+    "bg": {"remove_diacritics": GRAVE + ACUTE},
+    "lt": {"remove_diacritics": GRAVE + ACUTE + TILDE},
+    "sh": {
+        "remove_diacritics": GRAVE + ACUTE + DGRAVE + INVBREVE + MACRON + TILDE,
+        "remove_exceptions": "ćĆśŚźŹ",
+    },
+}  # type: Dict[str, Dict[str, str]]
+
+
+@lru_cache(maxsize=None)
+def _rule_code(code: str) -> Optional[str]:
+    # the code whose rule applies: the lang's own, or the nearest one up its etymology-only parents
+    seen = set()
+    while code and code not in seen:
+        if code in ENTRY_NAMES:
+            return code
+        seen.add(code)
+        row = codetable.get(codetable.ETY, code)
+        code = row.parent if row else None
+    return None
+
+
+# remove_exceptions are swapped for these before decomposing, and back afterwards
+_PRIVATE_USE = 0xE000
+
+
+@lru_cache(maxsize=None)
+def _tables(code: str) -> Tuple[Dict[int, int], Dict[int, Optional[str]]]:
+    """
+    (the table that protects the rule's remove_exceptions, the table that applies the rule)
+    """
+    rule = ENTRY_NAMES[code]
+    exceptions = rule.get("remove_exceptions", "")
+    protect = {ord(c): _PRIVATE_USE + i for i, c in enumerate(exceptions)}
+    table = {ord(c): None for c in rule.get("remove_diacritics", "")}
+    table.update(str.maketrans(rule.get("from", ""), rule.get("to", "")))
+    table.update({_PRIVATE_USE + i: c for i, c in enumerate(exceptions)})
+    return protect, table
+
+
+@lru_cache(maxsize=None)
+def _code(langname: str) -> Optional[str]:
+    return _rule_code(langcodes.code(langname, use_ety=True))
+
+
+def make_entry_name(word: str, langname: str = None) -> str:
+    """
+    The page title of word in langname, ie. plicō, Latin -> plico
+    """
+    code = _code(langname) if langname else None
+    if code is None or word.isascii():
+        return word
+    protect, table = _tables(code)
+    if protect:
+        word = unicodedata.normalize("NFC", word).translate(protect)
+    word = unicodedata.normalize("NFD", word).translate(table)
+    return unicodedata.normalize("NFC", word)
@@ -7,9 +7,32 @@ from langhelper import Language
 
 
 class QueryFlags:
+    """
+    Immutable, so that the ones query_to_qparts() returns can be shared between its callers
+    """
+
+    __slots__ = ("def_id", "deriv")
+
     def __init__(self, def_id: int, deriv=False):
-        self.def_id = def_id
-        self.deriv = deriv
+        object.__setattr__(self, "def_id", def_id)
+        object.__setattr__(self, "deriv", deriv)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"QueryFlags are immutable, can't set {name}")
+
+    def __eq__(self, other):
+        if not isinstance(other, QueryFlags):
+            return NotImplemented
+        return (self.def_id, self.deriv) == (other.def_id, other.deriv)
+
+    def __hash__(self):
+        return hash((self.def_id, self.deriv))
+
+    def __reduce__(self):
+        return QueryFlags, (self.def_id, self.deriv)
+
+    def __repr__(self):
+        return f"QueryFlags(def_id={self.def_id!r}, deriv={self.deriv!r})"
 
 
 def to_link(
@@ -73,7 +96,7 @@ def urlword(
     See function do_entry_name_or_sort_key_replacements()
     """
     # TODO: Unsupported titles
-    # TODO: do all of the entry_name fixes in https://en.wiktionary.org/wiki/Module:languages/data2, etc
+    # entry_name fixes are emulated for the langs in emulate.entryname.ENTRY_NAMES
     if not lang:
         if crash:
             raise ValueError(f"{word}'s lang is blank!")
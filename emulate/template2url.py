@@ -1,6 +1,9 @@
 import urllib
 from typing import Tuple
 
+from emulate import entryname
+from langcode import langcodes
+
 
 def urllang(lang: str):
     return urllib.parse.quote_plus(lang.langname.replace(" ", "_")) # Proto-West Germanic --> Proto-West_Germanic
@@ -13,13 +16,12 @@ def urlify(word):
 def mimicked_keyword(word: str, langname: str=None, is_reconstr=None, strip_reconstr_star=True) -> Tuple[str, str]:
     """
     Formerly mimicked_link_keyword
+    Strips what the lang's entry_name rules strip (see emulate.entryname), and a reconstruction's *
     """
-    if langname == "Latin":
-        for a, b in anti_macron:
-            word = word.replace(a, b)
+    word = entryname.make_entry_name(word, langname)
 
     if word.startswith("*") and strip_reconstr_star:
-        if is_reconstr or langname and langname.startswith("Proto"):  # TODO: Old English
+        if is_reconstr or langcodes.is_reconstr_name(langname):
             word = word[1:]
 
     return word
@@ -44,18 +46,3 @@ def emulated_keyword(key):
 
 def keyword(word: str, langname: str=None, is_reconstr=None, strip_reconstr_star=True):
     return mimicked_keyword(word, langname, is_reconstr=is_reconstr, strip_reconstr_star=strip_reconstr_star)
-
-
-anti_macron = [
-    ("Ā", "A"),
-    ("ā", "a"),
-    ("Ē", "E"),
-    ("ē", "e"),
-    ("Ī", "I"),
-    ("ī", "i"),
-    ("Ō", "O"),
-    ("ō", "o"),
-    ("Ū", "U"),
-    ("ū", "u"),
-    ("Ȳ", "Y"),
-    ("ȳ", "y")]
\ No newline at end of file
@@ -1,12 +1,19 @@
+import asyncio
 import json
+import os
 import warnings
 from enum import Enum
-from typing import Optional
+from functools import partial
+from typing import Optional, Union
 
 import requests
 from requests import Response
 
-from eobjects.mwparserhelper import wikitextparse, reduce_to_one_lang
+from eobjects.diskcache import DiskCache, normalize_url
+from eobjects.mwparserhelper import parse_one_lang, split_one_lang
+from eobjects.pagestore import PageStore
+from eobjects.ratelimit import RateLimiter, is_throttled
+from eobjects.singleflight import SingleFlight, AsyncSingleFlight
 
 # from eobjects.wikikey import WikiKey
 from etyobjects import MissingException
@@ -18,6 +25,35 @@ session.mount(
 )  # retry up to 2 times
 session.mount("https://", requests.adapters.HTTPAdapter(max_retries=2))
 
+# every request that goes out over the network, sync or async, draws from this one budget
+limiter = RateLimiter()
+
+# concurrent requests for the same url wait on the first one and share its response
+flights = SingleFlight()
+aflights = AsyncSingleFlight()
+
+# repeat queries are answered from disk. Set to None to always hit Wiktionary
+cache = DiskCache(
+    os.path.join(os.path.expanduser("~"), ".cache", "pyetymology", "api")
+)  # type: Optional[DiskCache]
+
+# when set, every request is answered from this store and nothing goes over the network. See go_offline()
+offline_store = None  # type: Optional[PageStore]
+
+
+def go_offline(store: Union[PageStore, str]):
+    """
+    store: a PageStore, or the path of one
+    """
+    global offline_store
+    offline_store = store if isinstance(store, PageStore) else PageStore(store)
+    return offline_store
+
+
+def go_online():
+    global offline_store
+    offline_store = None
+
 
 class APIResult:
     def __init__(
@@ -34,18 +70,28 @@ class APIResult:
         check_json(self)
         self.wikitype = None
 
+    @classmethod
+    async def afetch(cls, fullurl) -> "APIResult":
+        """
+        Async counterpart of APIResult(fullurl). See amake_http_request()
+        """
+        response, jsn = await amake_http_request(fullurl)
+        return cls(fullurl, response, jsn)
+
     def load_wikitext(
         self,
         wkey: Optional["WikiKey"],
         infer_lang=True,
         override_lang=False,
         resolve_multilang=None,
+        raw=False,
     ):
         """
         Setting infer_lang=True enables Lang Inferral
         This means after this, Lang should be defined always, or an error thrown
+        raw=True leaves the page unparsed: see parse_json()
         """
-        jsoninfo = parse_json(self, wkey)  # a lot of code here
+        jsoninfo = parse_json(self, wkey, raw=raw)  # a lot of code here
 
         """
         # TODO: more graceful failure method. For example on failure, use a lambda to pick a language
@@ -82,19 +128,149 @@ class APIResult:
         return self.Lang.langname
 
 
-def make_http_request(fullurl: str, online=True):
+def make_http_request(
+    fullurl: str, online: Optional[bool] = None, use_cache: bool = True
+):
+    """
+    online=None means go online unless an offline store has been set with go_offline()
+    use_cache=False neither looks the response up in the cache nor writes it there,
+    ie. for batch responses, whose pages are cached one by one instead (see batchfetch)
+    """
+    if online is None:
+        online = offline_store is None
     if online:
-        global session
-        res = session.get(fullurl)
-        # cache res TODO: implement better caching with test_'s fetch stuff
+        txt = cache.get(fullurl) if cache and use_cache else None
+        if txt is not None:
+            return local_response(fullurl, txt), json.loads(txt)
+        # urls differing only by #lang etc. are one request; see diskcache.normalize_url
+        return flights.do(
+            normalize_url(fullurl), partial(_fetch, fullurl, use_cache=use_cache)
+        )
     else:
-        raise Exception("offline browsing not implemented yet")
+        if offline_store is None:
+            raise Exception("offline browsing needs a page store. See go_offline()")
+        txt = offline_store.answer(fullurl)
+        return local_response(fullurl, txt), json.loads(txt)
+
+
+def _fetch(fullurl: str, use_cache: bool = True):
+    res = polite_get(fullurl)
     txt = res.text
     # print(txt)
     jsn = json.loads(txt)  # type: json
+    if cache and use_cache and is_cacheable(res, jsn):
+        cache.put(fullurl, txt)
+    return res, jsn
+
+
+# aiohttp.ClientSession for the async path. A session belongs to the event loop it was made in, so we keep one per loop
+_asessions = {}
+
+
+async def _get_asession():
+    loop = asyncio.get_running_loop()
+    asession = _asessions.get(loop)
+    if asession is None or asession.closed:
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(
+                "The async fetch path (APIResult.afetch, WikiKey.aload_result) needs aiohttp. pip install aiohttp"
+            ) from None
+        for stale in [l for l in _asessions if l.is_closed()]:
+            del _asessions[stale]
+        asession = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20),
+            timeout=aiohttp.ClientTimeout(total=60),
+        )
+        _asessions[loop] = asession
+    return asession
+
+
+async def aclose():
+    """
+    Closes the running loop's async session. Call before the loop shuts down to avoid aiohttp's unclosed session warning.
+    """
+    asession = _asessions.pop(asyncio.get_running_loop(), None)
+    if asession is not None:
+        await asession.close()
+
+
+def polite_get(fullurl: str) -> Response:
+    """
+    session.get, rate limited by limiter. Throttled requests (429, maxlag...) are retried with backoff,
+    up to limiter.max_retries times, after which the last response is returned as is.
+    """
+    global session
+    for attempt in range(limiter.max_retries + 1):
+        limiter.acquire()
+        res = session.get(fullurl, params=limiter.params)
+        if attempt == limiter.max_retries or not is_throttled(
+            res.status_code, res.text
+        ):
+            return res
+        limiter.backoff(attempt, res.headers)
+
+
+async def amake_http_request(fullurl: str, online: Optional[bool] = None):
+    """
+    Async counterpart of make_http_request(). Shares its cache and offline store.
+    """
+    if online is None:
+        online = offline_store is None
+    if not online:
+        # a local lookup, there's nothing to wait for
+        return make_http_request(fullurl, online=False)
+    txt = cache.get(fullurl) if cache else None
+    if txt is not None:
+        return local_response(fullurl, txt), json.loads(txt)
+    return await aflights.do(normalize_url(fullurl), partial(_afetch, fullurl))
+
+
+async def _afetch(fullurl: str):
+    asession = await _get_asession()
+    for attempt in range(limiter.max_retries + 1):
+        await limiter.aacquire()
+        async with asession.get(fullurl, params=limiter.params) as ares:
+            txt = await ares.text()
+            status = ares.status
+            headers = ares.headers
+        if attempt == limiter.max_retries or not is_throttled(status, txt):
+            break
+        limiter.backoff(attempt, headers)
+    res = local_response(fullurl, txt)
+    res.status_code = status
+    jsn = json.loads(txt)
+    if cache and is_cacheable(res, jsn):
+        cache.put(fullurl, txt)
     return res, jsn
 
 
+def local_response(fullurl: str, txt: str) -> Response:
+    """
+    Dresses up a response body that didn't come from session (cached, stored or async)
+    so that APIResult.response behaves the same as a live one.
+    """
+    res = Response()
+    res.status_code = 200
+    res.url = fullurl
+    res.encoding = "utf-8"
+    res._content = txt.encode("utf-8")
+    return res
+
+
+def is_cacheable(res: Response, jsn) -> bool:
+    """
+    Only cache pages and categories, plus missing pages (so we stop asking for them).
+    Transient errors such as maxlag or ratelimited should be retried instead.
+    """
+    if res.status_code != 200:
+        return False
+    if "error" in jsn:
+        return jsn["error"].get("code") == "missingtitle"
+    return True
+
+
 def check_json(result: APIResult):
     jsn = result.jsn
     fullurl = result.fullurl
@@ -119,10 +295,13 @@ def parse_json(
     wkey: Optional["WikiKey"] = None,
     use_lang=None,
     resolve_multilang=None,
+    raw=False,
 ):
     """
     BUILT IN: Lang reducing function.
     AFTER parse_json, lang should be defined ALWAYS, or an error thrown.
+    raw: don't parse the page. The dom is then the lang's sections as wikitext and res is None
+    (see mwparserhelper.split_one_lang()), which is all that graphing needs.
     """
     jsn = result.jsn
 
@@ -139,11 +318,13 @@ def parse_json(
     # https://en.wiktionary.org/w/api.php?action=query&list=categorymembers&cmtitle=Category:English_terms_derived_from_the_Proto-Indo-European_root_*ple%E1%B8%B1-&cmprop=title
     elif "parse" in jsn:
         wikitext = jsn["parse"]["wikitext"]
-        res, dom = wikitextparse(wikitext, redundance=False)
         # Here was the lang detection
-        dom, langname = reduce_to_one_lang(
-            dom, use_lang=use_lang if use_lang else wkey.Lang.langname
-        )
+        use_lang = use_lang if use_lang else wkey.Lang.langname
+        if raw:
+            res = None
+            dom, langname = split_one_lang(wikitext, use_lang=use_lang)
+        else:
+            res, dom, langname = parse_one_lang(wikitext, use_lang=use_lang)
 
         title = jsn["parse"]["title"]
         if title.startswith("Reconstruction:"):
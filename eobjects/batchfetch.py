@@ -0,0 +1,137 @@
+"""
+Loads the results of many WikiKeys in as few api calls as possible.
+Instead of one action=parse call per page, pages are requested up to 50 at a time with
+https://en.wiktionary.org/w/api.php?action=query&prop=revisions&rvprop=content&rvslots=main&titles=A|B|C
+and each page of the response is split back out into the APIResult that its action=parse url would have given.
+"""
+
+import json
+from typing import List, Optional, Dict
+from urllib.parse import urlsplit, parse_qs, quote
+
+from eobjects import apiresult
+from eobjects.apiresult import APIResult, make_http_request
+from eobjects.pagestore import normalize_title
+
+# the most titles the api accepts per call (without the apihighlimits right)
+BATCH_LIMIT = 50
+
+
+def page_title(fullurl: str) -> Optional[str]:
+    """
+    Returns the page that an action=parse url asks for, or None for any other kind of url.
+    """
+    params = parse_qs(urlsplit(fullurl).query)
+    if params.get("action") == ["parse"] and "page" in params:
+        return normalize_title(params["page"][0])
+    return None
+
+
+def batch_url(titles: List[str]) -> str:
+    return (
+        "https://en.wiktionary.org/w/api.php?action=query&prop=revisions&rvprop=content&rvslots=main"
+        f"&formatversion=2&format=json&titles={quote('|'.join(titles))}"
+    )
+
+
+def split_batch(jsn) -> Dict[str, dict]:
+    """
+    Splits a multi-title response into {title: the json action=parse would have returned for that title}.
+    Pages the api left out (ie. it truncated an oversized response) are absent, so the caller can fetch them singly.
+    """
+    retn = {}
+    query = jsn.get("query", {})
+    for page in query.get("pages", []):
+        title = page["title"]
+        if page.get("missing") or page.get("invalid"):
+            retn[title] = {
+                "error": {
+                    "code": "missingtitle",
+                    "info": "The page you specified doesn't exist.",
+                }
+            }
+        elif page.get("revisions"):
+            content = page["revisions"][0]["slots"]["main"]["content"]
+            retn[title] = {
+                "parse": {
+                    "title": title,
+                    "pageid": page.get("pageid", 0),
+                    "wikitext": content,
+                }
+            }
+    # the api answers under the normalized title
+    for norm in query.get("normalized", []):
+        if norm["to"] in retn:
+            retn[norm["from"]] = retn[norm["to"]]
+    return retn
+
+
+def load_results(
+    wkeys: List["WikiKey"], batch_size: int = BATCH_LIMIT
+) -> List[Optional[Exception]]:
+    """
+    Loads the result of every wkey that doesn't have one yet.
+    Pages are fetched batch_size titles per call, unless they're in the cache; other urls (ie. categories)
+    are fetched one by one.
+    Returns, for each wkey, None or the exception raised while loading it (ie. MissingException for a missing page).
+    """
+    errors = [None] * len(wkeys)  # type: List[Optional[Exception]]
+    # title -> indices of the wkeys that want it
+    pending = {}  # type: Dict[str, List[int]]
+    singles = []
+    for i, wkey in enumerate(wkeys):
+        if wkey.result:
+            continue
+        title = page_title(wkey.fullurl)
+        if title is None or apiresult.offline_store is not None:
+            singles.append(i)  # nothing to gain from batching local lookups
+            continue
+        txt = apiresult.cache.get(wkey.fullurl) if apiresult.cache else None
+        if txt is None:
+            pending.setdefault(title, []).append(i)
+            continue
+        try:  # only the cache misses go out in batches
+            wkey.load_result(
+                APIResult(
+                    wkey.fullurl,
+                    apiresult.local_response(wkey.fullurl, txt),
+                    json.loads(txt),
+                )
+            )
+        except Exception as e:
+            errors[i] = e
+
+    titles = list(pending)
+    for start in range(0, len(titles), batch_size):
+        # sorted, so that concurrent identical batches share one flight
+        chunk = sorted(titles[start : start + batch_size])
+        try:
+            # only the pages are cached: a whole batch is hardly ever asked for again
+            response, jsn = make_http_request(batch_url(chunk), use_cache=False)
+            pages = split_batch(jsn)
+        except Exception as e:
+            for title in chunk:
+                for i in pending[title]:
+                    errors[i] = e
+            continue
+        for title in chunk:
+            page = pages.get(title)
+            if page is None:
+                singles.extend(pending[title])
+                continue
+            for i in pending[title]:
+                wkey = wkeys[i]
+                if apiresult.cache:
+                    # later single-page fetches of this url are now cache hits
+                    apiresult.cache.put(wkey.fullurl, json.dumps(page))
+                try:
+                    wkey.load_result(APIResult(wkey.fullurl, response, page))
+                except Exception as e:
+                    errors[i] = e
+
+    for i in singles:
+        try:
+            wkeys[i].load_result()
+        except Exception as e:
+            errors[i] = e
+    return errors
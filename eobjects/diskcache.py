@@ -0,0 +1,149 @@
+"""
+Content-addressed on-disk cache for Wiktionary API responses.
+Entries are keyed by the normalized API url, so that
+http://...&page=plico&...#Latin and https://...&page=plico&... share one file.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Optional, Dict
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+def normalize_url(fullurl: str) -> str:
+    """
+    Reduces an api url to the parts that actually change the response.
+    The scheme and the #lang fragment are dropped (the api ignores both),
+    and the query parameters are decoded, sorted and re-encoded.
+    """
+    parts = urlsplit(fullurl)
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    return f"{parts.netloc.lower()}{parts.path}?{urlencode(params)}"
+
+
+class DiskCache:
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 7 * 24 * 60 * 60,
+        max_bytes: int = 256 * 1024 * 1024,
+        low_water: float = 0.9,
+    ):
+        """
+        directory: where the cached responses are written. Created on first write.
+        ttl: seconds a response stays fresh, counted from when it was written.
+        max_bytes: once exceeded, the least recently used responses are evicted.
+        low_water: eviction goes down to this fraction of max_bytes, so that the directory isn't rescanned on every
+            put once the cache is full.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None  # type: Optional[int] # computed lazily, see _total_size()
+        self._lock = threading.Lock()
+
+    def _path(self, fullurl: str) -> str:
+        digest = hashlib.sha256(normalize_url(fullurl).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".json")
+
+    def _files(self):
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for f in os.scandir(sub.path):
+                    if f.name.endswith(".json"):
+                        yield f
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            self._size = sum(f.stat().st_size for f in self._files())
+        return self._size
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return  # another process beat us to it
+        if self._size is not None:
+            self._size -= size
+
+    def get(self, fullurl: str) -> Optional[str]:
+        """
+        Returns the cached response text, or None if it is missing or stale.
+        """
+        path = self._path(fullurl)
+        # the file is read outside of the lock: puts replace files atomically, so a reader sees one whole response
+        txt = None
+        try:
+            written = os.path.getmtime(path)
+            if time.time() - written <= self.ttl:
+                with open(path, encoding="utf-8") as f:
+                    txt = f.read()
+        except FileNotFoundError:
+            written = None
+        with self._lock:
+            try:
+                current = os.path.getmtime(path)
+            except FileNotFoundError:
+                current = None
+            if txt is None:
+                if written is not None and current == written:
+                    self._remove(path)  # stale, and not put again since
+                self.misses += 1
+                return None
+            if current == written:
+                # mtime records when the response was written (for the ttl), atime when it was last used (for the lru)
+                os.utime(path, (time.time(), written))
+            self.hits += 1
+            return txt
+
+    def put(self, fullurl: str, txt: str):
+        path = self._path(fullurl)
+        data = txt.encode("utf-8")
+        with self._lock:
+            size = self._total_size()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                size -= os.path.getsize(path)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)  # atomic, so readers never see half a response
+            self._size = size + len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        Deletes the least recently used responses until we're down to low_water of max_bytes.
+        """
+        target = self.max_bytes * self.low_water
+        files = sorted(self._files(), key=lambda f: f.stat().st_atime)
+        for f in files:
+            if self._size <= target:
+                break
+            self._remove(f.path)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for f in list(self._files()):
+                self._remove(f.path)
+            self._size = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._total_size(),
+        }
@@ -0,0 +1,63 @@
+"""
+In-process cache of parsed, language-reduced pages, so mwparserfromhell only ever parses a given page once.
+See mwparserhelper.parse_one_lang()
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Any, Optional, Dict
+
+
+class DomCache:
+    def __init__(self, max_chars: int = 20_000_000):
+        """
+        max_chars: bound on the total wikitext length of the cached pages.
+        Parsed trees are roughly proportional in size to their wikitext, so this bounds memory too.
+        """
+        self.max_chars = max_chars
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.chars -= old[1]
+            self._entries[key] = (value, size)
+            self.chars += size
+            while self.chars > self.max_chars and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.chars -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.chars = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "chars": self.chars,
+        }
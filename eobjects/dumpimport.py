@@ -0,0 +1,99 @@
+"""
+Streams an enwiktionary pages-articles dump into a PageStore, so that whole corpora can be queried offline.
+See https://dumps.wikimedia.org/enwiktionary/
+
+    python -m eobjects.dumpimport enwiktionary-latest-pages-articles.xml.bz2 pages.sqlite
+
+Note that category membership isn't part of the dump, so derivation (#*root) queries still need the api.
+"""
+
+import bz2
+import sys
+import xml.etree.ElementTree as ET
+from typing import Generator, Tuple, Iterable, Callable, Optional
+
+from eobjects.pagestore import PageStore
+
+MAIN = 0  # namespace ids, see https://en.wiktionary.org/wiki/Help:Namespace
+RECONSTRUCTION = 118
+
+
+def _tag(elem: ET.Element) -> str:
+    return elem.tag.rsplit("}", 1)[
+        -1
+    ]  # strip the {http://www.mediawiki.org/xml/export-0.10/} namespace
+
+
+def _child(elem: ET.Element, name: str) -> Optional[ET.Element]:
+    for child in elem:
+        if _tag(child) == name:
+            return child
+    return None
+
+
+def iter_pages(
+    path: str, namespaces: Iterable[int] = (MAIN, RECONSTRUCTION)
+) -> Generator[Tuple[str, str, int], None, None]:
+    """
+    Yields (title, wikitext, pageid) for every page in one of the namespaces.
+    Each <page> is discarded as soon as it has been yielded, so memory stays flat no matter the size of the dump.
+    """
+    namespaces = set(namespaces)
+    opener = bz2.open if path.endswith(".bz2") else open
+    with opener(path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(
+            context
+        )  # <mediawiki>; everything we've finished with gets cleared from it
+        for event, elem in context:
+            if event != "end" or _tag(elem) != "page":
+                continue
+            ns = _child(elem, "ns")
+            if ns is not None and int(ns.text) in namespaces:
+                revision = _child(elem, "revision")
+                text = _child(revision, "text") if revision is not None else None
+                if text is not None:
+                    yield _child(elem, "title").text, text.text or "", int(
+                        _child(elem, "id").text
+                    )
+            root.clear()
+
+
+def import_dump(
+    path: str,
+    store: PageStore,
+    namespaces: Iterable[int] = (MAIN, RECONSTRUCTION),
+    batch_size: int = 1000,
+    progress: Callable[[int], None] = None,
+) -> int:
+    """
+    Writes the pages of the dump into store, batch_size pages per transaction.
+    Returns the number of pages imported.
+    """
+    count = 0
+    batch = []
+    for page in iter_pages(path, namespaces):
+        batch.append(page)
+        if len(batch) >= batch_size:
+            store.put_pages(batch)
+            count += len(batch)
+            batch = []
+            if progress:
+                progress(count)
+    if batch:
+        store.put_pages(batch)
+        count += len(batch)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(
+            "usage: python -m eobjects.dumpimport <pages-articles.xml.bz2> <store.sqlite>"
+        )
+        sys.exit(1)
+    _store = PageStore(sys.argv[2])
+    total = import_dump(
+        sys.argv[1], _store, progress=lambda n: print(f"{n} pages", end="\r")
+    )
+    print(f"imported {total} pages into {sys.argv[2]}")
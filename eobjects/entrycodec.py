@@ -0,0 +1,268 @@
+"""
+A compact, versioned json format for lexed entries (lexer.Entry), so that a query can be stored and reloaded
+without running mwparserfromhell again.
+
+The top level nodes of the lang section are stored once, in page order, and every header's wikicode and
+subordinates are [start, end) spans of them. So a redundant dom, whose sections contain their subsections,
+costs no more than a flat one.
+
+Only the nodes that parse_and_graph() and lexer.lex() look at are rebuilt as real mwparserfromhell nodes:
+    Text        "plain text"
+    Template    {"t": name, "p": [param, ...]}
+    Heading     {"h": level, "c": title}
+where a param is its value if it's positional, [name, value] if it's named, or [name, value, 0] if its name is
+hidden but isn't its position. A value (or title) is a str if it's plain text, else [[nodes]].
+Everything else (tags, wikilinks, comments...) becomes an Opaque node, which prints as the original markup
+and keeps any templates inside of it visible to recursive filters. Its markup is split around those templates:
+    Opaque      ["original markup"] or ["markup before", template, "markup after", ...]
+"""
+
+import json
+from typing import List, Optional, Tuple, Dict, Any, Iterator
+
+from mwparserfromhell.nodes import Node, Text, Template, Heading
+from mwparserfromhell.nodes.extras import Parameter
+from mwparserfromhell.wikicode import Wikicode
+
+from lexer import Header, Entry
+
+FORMAT = "pyetymology-entries"
+VERSION = 2
+
+
+class Opaque(Node):
+    def __init__(self, raw: str, children: Wikicode):
+        super().__init__()
+        self.raw = raw
+        self.children = children
+
+    def __str__(self):
+        return self.raw
+
+    def __children__(self):
+        yield self.children
+
+
+def _encode_nodes(code: Wikicode) -> list:
+    return [_encode_node(node) for node in code.nodes]
+
+
+def _encode_value(code: Wikicode):
+    if not code.nodes:
+        return ""
+    if len(code.nodes) == 1 and isinstance(code.nodes[0], Text):
+        return code.nodes[0].value
+    return [_encode_nodes(code)]
+
+
+def _encode_params(params: List[Parameter]) -> list:
+    encs = []
+    position = 0
+    for p in params:
+        name, value = str(p.name), _encode_value(p.value)
+        if p.showkey:
+            encs.append([name, value])
+            continue
+        position += 1
+        encs.append(value if name == str(position) else [name, value, 0])
+    return encs
+
+
+def _encode_node(node: Node):
+    if isinstance(node, Text):
+        return node.value
+    if isinstance(node, Template):
+        return {"t": str(node.name), "p": _encode_params(node.params)}
+    if isinstance(node, Heading):
+        return {"h": node.level, "c": _encode_value(node.title)}
+    return _encode_opaque(node)
+
+
+def _outer_templates(node: Node) -> Iterator[Template]:
+    # the templates inside of node that aren't inside of another template, in order
+    for code in node.__children__():
+        for child in code.nodes:
+            if isinstance(child, Template):
+                yield child
+            else:
+                yield from _outer_templates(child)
+
+
+def _encode_opaque(node: Node) -> list:
+    raw = str(node)
+    pieces = []
+    cursor = 0
+    for template in _outer_templates(node):
+        at = raw.find(str(template), cursor)
+        if at < 0:
+            return [raw]
+        if at > cursor:
+            pieces.append(raw[cursor:at])
+        pieces.append(_encode_node(template))
+        cursor = at + len(str(template))
+    if not pieces:
+        return [raw]
+    if cursor < len(raw):
+        pieces.append(raw[cursor:])
+    return pieces
+
+
+# Every constructor gets a ready-made Wikicode: given a str, mwparserfromhell would parse it
+def _text(s: str) -> Wikicode:
+    return Wikicode([Text(s)])
+
+
+def _decode_nodes(encs: list) -> Wikicode:
+    return Wikicode([_decode_node(enc) for enc in encs])
+
+
+def _decode_value(enc) -> Wikicode:
+    if isinstance(enc, str):
+        return _text(enc) if enc else Wikicode([])
+    return _decode_nodes(enc[0])
+
+
+def _decode_params(encs: list) -> List[Parameter]:
+    params = []
+    position = 0
+    for enc in encs:
+        if isinstance(enc, str) or len(enc) == 1:  # positional
+            position += 1
+            params.append(Parameter(_text(str(position)), _decode_value(enc), False))
+        else:
+            name, value, *showkey = enc
+            params.append(
+                Parameter(
+                    _text(name),
+                    _decode_value(value),
+                    bool(showkey[0]) if showkey else True,
+                )
+            )
+            if showkey:
+                position += 1
+    return params
+
+
+def _decode_node(enc) -> Node:
+    if isinstance(enc, str):
+        return Text(enc)
+    if isinstance(enc, list):
+        if len(enc) == 1 and isinstance(enc[0], str):
+            return Opaque(enc[0], Wikicode([]))
+        children = _decode_nodes(enc)
+        return Opaque(str(children), children)
+    if "t" in enc:
+        return Template(_text(enc["t"]), _decode_params(enc["p"]))
+    if "h" in enc:
+        return Heading(_decode_value(enc["c"]), enc["h"])
+    raise ValueError(f"Not a serialized node: {enc!r}")
+
+
+class _NodeTable:
+    """
+    The encoded nodes, each stored once. Sections that share nodes (by identity, as get_sections()'s do)
+    are spans of the same stretch of the table.
+    """
+
+    def __init__(self):
+        self.encs = []  # type: List[Any]
+        self.pos = {}  # type: Dict[int, int] # id(node) -> its index in encs
+        self._keep = []  # type: List[Node] # so that no id is reused while encoding
+
+    def span(self, code: Wikicode) -> List[int]:
+        nodes = code.nodes
+        at = [self.pos.get(id(node)) for node in nodes]
+        if nodes and at[0] is not None and at == list(range(at[0], at[0] + len(at))):
+            return [at[0], at[0] + len(at)]
+        start = len(self.encs)  # (partly) unseen: stored anew
+        for node in nodes:
+            self.pos.setdefault(id(node), len(self.encs))
+            self.encs.append(_encode_node(node))
+            self._keep.append(node)
+        return [start, len(self.encs)]
+
+
+def _encode_header(header: Optional[Header], table: _NodeTable) -> Optional[dict]:
+    if header is None:
+        return None
+    return {
+        "lvl": header.lvl,
+        "type": header.header_type,
+        "idx": header.idx,
+        "meta": header.metainfo,
+        "wc": table.span(header.wikicode),
+        "subs": [table.span(sub) for sub in header.subordinates],
+    }
+
+
+def _decode_header(enc: Optional[dict], nodes: List[Node]) -> Optional[Header]:
+    if enc is None:
+        return None
+    return Header(
+        Wikicode(nodes[slice(*enc["wc"])]),
+        [Wikicode(nodes[slice(*sub)]) for sub in enc["subs"]],
+        header_type=enc["type"],
+        idx=enc["idx"],
+        metainfo=enc["meta"],
+        lvl=enc["lvl"],
+    )
+
+
+def encode_entries(entries: List[Entry]) -> Tuple[list, list]:
+    """
+    Returns (the encoded entries, the encoded nodes that their headers are spans of)
+    """
+    table = _NodeTable()
+    encs = [
+        {
+            "ety": _encode_header(entry.ety, table),
+            "extras": [_encode_header(h, table) for h in entry.extras],
+            "desc": [_encode_header(h, table) for h in entry.desc],
+        }
+        for entry in entries
+    ]
+    return encs, table.encs
+
+
+def decode_entries(encs: list, node_encs: list) -> List[Entry]:
+    nodes = [_decode_node(enc) for enc in node_encs]
+    return [
+        Entry(
+            _decode_header(enc["ety"], nodes),
+            [_decode_header(h, nodes) for h in enc["extras"]],
+            [_decode_header(h, nodes) for h in enc["desc"]],
+        )
+        for enc in encs
+    ]
+
+
+def dumps(entries: List[Entry], meta: Dict[str, Any] = None) -> str:
+    """
+    meta: anything else json-serializable to store alongside, ie. the query
+    """
+    encs, node_encs = encode_entries(entries)
+    return json.dumps(
+        {
+            "format": FORMAT,
+            "version": VERSION,
+            "meta": meta or {},
+            "nodes": node_encs,
+            "entries": encs,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def loads(s: str) -> Tuple[List[Entry], Dict[str, Any]]:
+    """
+    Returns (entries, meta). Raises ValueError for anything that isn't this format and version.
+    """
+    data = json.loads(s)
+    if not isinstance(data, dict) or data.get("format") != FORMAT:
+        raise ValueError("Not a serialized list of entries")
+    if data.get("version") != VERSION:
+        raise ValueError(
+            f"Serialized entries have version {data.get('version')}, expected {VERSION}"
+        )
+    return decode_entries(data["entries"], data["nodes"]), data["meta"]
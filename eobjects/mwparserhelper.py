@@ -1,12 +1,20 @@
+import hashlib
+import re
 import string
-from typing import Tuple, List, Generator, Callable
+from collections import OrderedDict
+from typing import Tuple, List, Generator, Callable, Optional, Dict
 
 import mwparserfromhell as mwp
+from mwparserfromhell.nodes import Heading
 from mwparserfromhell.wikicode import Wikicode
 
 from eobjects import fixins
+from eobjects.domcache import DomCache
 from etyobjects import MissingException
 
+# (page revision, lang, redundance) -> parse_one_lang()'s result. Set to None to always reparse
+dom_cache = DomCache()  # type: Optional[DomCache]
+
 
 def wikitextparse(wikitext: str, redundance=False) -> Tuple[Wikicode, List[Wikicode]]:
     res = mwp.parse(wikitext)  # type: Wikicode
@@ -15,25 +23,159 @@ def wikitextparse(wikitext: str, redundance=False) -> Tuple[Wikicode, List[Wikic
     return res, dom
 
 
-def reduce_to_one_lang(
-    dom: List[Wikicode], use_lang: str = None, permit_abbrevs=True, use_input=True
-) -> Tuple[List[Wikicode], str]:
+def parse_one_lang(
+    wikitext: str, use_lang: str = None, redundance=False, lazy=True
+) -> Tuple[Wikicode, List[Wikicode], str]:
     """
-    Returns sections of only 1 lang
+    wikitextparse() followed by reduce_to_one_lang(), remembered in dom_cache.
+    The page revision is identified by its wikitext, so an edited page is reparsed.
+    The returned Wikicode is shared between callers, and must not be modified.
+    lazy: only parse the chosen lang's section (see parse_lang_slice()). Then res is that section, not the whole page.
     """
-    lang = ""
-    # try to extract lang from dom
-    found_langs = all_lang_sections(dom, flat=True)
+    revision = hashlib.sha1(wikitext.encode("utf-8")).hexdigest()
+    # a blank use_lang may be resolved by asking for input, so only the answer can be looked up, not the question
+    if use_lang and dom_cache is not None:
+        cached = dom_cache.get((revision, use_lang, redundance, lazy))
+        if cached is not None:
+            return cached
+    parsed = (
+        parse_lang_slice(wikitext, use_lang=use_lang, redundance=redundance)
+        if lazy
+        else None
+    )
+    if parsed is None:
+        res, dom = wikitextparse(wikitext, redundance=redundance)
+        dom, langname = reduce_to_one_lang(dom, use_lang=use_lang)
+        parsed = res, dom, langname
+    langname = parsed[2]
+    if dom_cache is not None:
+        for lang in {use_lang, langname} - {None, ""}:
+            # lazy is in the key, since a lazy res is only the lang's section
+            dom_cache.put((revision, lang, redundance, lazy), parsed, len(wikitext))
+    return parsed
+
+
+# A level 2 heading on a line of its own, ie. "==Spanish==" but not "===Etymology==="
+_lang_heading = re.compile(r"^==(?!=)(.*[^=])==[ \t]*$", re.MULTILINE)
+# Markup that a heading inside of isn't a heading at all. Unterminated, they run to the end of the page
+_unparsed = re.compile(
+    r"<!--.*?(?:-->|\Z)|<(nowiki|pre)\b.*?(?:</\1\s*>|\Z)", re.DOTALL | re.IGNORECASE
+)
+
+
+def scan_langs(wikitext: str) -> Dict[str, Tuple[int, int]]:
+    """
+    The raw wikitext counterpart of index_langs(): lang -> (start, end), where wikitext[start:end] is that lang's
+    section, found without parsing. Headings inside of comments, <nowiki> and <pre> are skipped.
+    """
+    unparsed = [m.span() for m in _unparsed.finditer(wikitext)]
+    spans = OrderedDict()  # type: Dict[str, Tuple[int, int]]
+    lang, start = None, 0
+    for m in _lang_heading.finditer(wikitext):
+        if any(a <= m.start() < b for a, b in unparsed):
+            continue
+        if lang is not None:
+            spans.setdefault(lang, (start, m.start()))
+        lang, start = m.group(1), m.start()
+    if lang is not None:
+        spans.setdefault(lang, (start, len(wikitext)))
+    return spans
+
+
+def parse_lang_slice(
+    wikitext: str, use_lang: str = None, redundance=False
+) -> Optional[Tuple[Wikicode, List[Wikicode], str]]:
+    """
+    Like wikitextparse() then reduce_to_one_lang(), but only the chosen lang's section is given to mwparserfromhell.
+    Returns None if the scan can't be trusted: it found no langs, none of them is use_lang,
+    or the section parses differently on its own. Then the whole page should be parsed instead.
+    """
+    spans = scan_langs(wikitext)
+    if not scan_has_lang(spans, use_lang):
+        return None
+    lang = choose_lang(list(spans), use_lang=use_lang)
+    start, end = spans[lang]
+    res, dom = wikitextparse(wikitext[start:end], redundance=redundance)
+    if list(index_langs(dom)) != [lang]:
+        return None  # the scan missed a heading, ie. one followed by a comment
+    dom, langname = reduce_to_one_lang(dom, use_lang=lang)
+    return res, dom, langname
+
+
+def scan_has_lang(spans: Dict[str, Tuple[int, int]], use_lang: str = None) -> bool:
+    """
+    Whether scan_langs() found use_lang (or what it abbreviates, as in choose_lang()).
+    Otherwise, the scan may just have missed it, and the wrong lang would be chosen.
+    """
+    if not spans:
+        return False
+    return not use_lang or any(
+        lang.lower().startswith(use_lang.lower()) for lang in spans
+    )
+
+
+# A heading on a line of its own, as mwparserfromhell reads it: the shorter run of ='s is its level
+_heading = re.compile(r"^(={1,6})(.+?)(={1,6})[ \t]*$", re.MULTILINE)
+
+
+def raw_heading(sec: str) -> Optional[Tuple[int, str]]:
+    """
+    (level, title) of the heading that a raw section starts with, or None for the lead
+    """
+    m = _heading.match(sec)
+    if not m:
+        return None
+    left, title, right = m.groups()
+    lvl = min(len(left), len(right))
+    return lvl, left[lvl:] + title + right[lvl:]
 
-    def _compr(found_langs):
-        for found_lang in found_langs:
-            found_lang: Wikicode
-            h = found_lang[
-                2:
-            ]  # EDIT: with flat=True, disregard the following. found_lang should be array of length 1, because recursive is false
-            yield h[: h.index("==")]
 
-    lang_options = list(_compr(found_langs))
+def split_sections(text: str, redundance=False) -> List[str]:
+    """
+    The raw wikitext counterpart of wikitextparse()'s dom: text split at its headings, without parsing.
+    Like scan_langs(), headings inside of comments, <nowiki> and <pre> are skipped.
+    """
+    unparsed = [m.span() for m in _unparsed.finditer(text)]
+    starts = [
+        (m.start(), raw_heading(m.group())[0])
+        for m in _heading.finditer(text)
+        if not any(a <= m.start() < b for a, b in unparsed)
+    ]
+    secs = [text[: starts[0][0] if starts else len(text)]]  # the lead, even if blank
+    for i, (start, lvl) in enumerate(starts):
+        ends = (s for s, l in starts[i + 1 :] if not redundance or l <= lvl)
+        secs.append(text[start : next(ends, len(text))])
+    return secs
+
+
+def split_one_lang(
+    wikitext: str, use_lang: str = None, redundance=False
+) -> Tuple[List[str], str]:
+    """
+    Like parse_one_lang(), but the chosen lang's sections are kept as raw wikitext rather than parsed.
+    lexer.lex() reads them just the same, and parse_and_graph() reads their templates with templatescan.
+    If the scan can't be trusted, the page is parsed after all, and its sections are returned as wikitext.
+    """
+    spans = scan_langs(wikitext)
+    if scan_has_lang(spans, use_lang):
+        lang = choose_lang(list(spans), use_lang=use_lang)
+        start, end = spans[lang]
+        text = wikitext[start:end]
+        secs = split_sections(text, redundance=redundance)
+        # every line that might be a heading was split at (and the slice starts at the lang's, so the lead is blank)
+        if text.count("\n=") == len(secs) - 2:
+            return secs[1:], lang
+    _, dom, lang = parse_one_lang(wikitext, use_lang=use_lang, redundance=redundance)
+    return [str(sec) for sec in dom], lang
+
+
+def choose_lang(
+    lang_options: List[str], use_lang: str = None, permit_abbrevs=True, use_input=True
+) -> str:
+    """
+    Picks one of the langs on a page: the only one, use_lang (or what it abbreviates), or else what the user inputs.
+    """
+    lang = ""
     if len(lang_options) == 0:
         raise MissingException(
             "Zero langs detected !? !?", missing_thing="language_sections"
@@ -41,33 +183,50 @@ def reduce_to_one_lang(
     elif len(lang_options) == 1:
         lang = lang_options[0]
     else:
+        if use_lang:
+            usrin = use_lang
+        elif use_input:  # if it's possible to read input from the console
+            # TODO End the use of use_input
+            usrin = fixins.input(
+                "Choose a lang from these options: " + str(lang_options)
+            )
+        else:  # if such is not possible
+            raise MissingException(
+                f"Could not auto-infer language from the languages {str(lang_options)}.",
+                missing_thing="language_specification",
+            )
+        if usrin in lang_options:
+            lang = usrin
+        elif permit_abbrevs:
+            for lang_opt in lang_options:  # abbreviations
+                if str.lower(lang_opt).startswith(str.lower(usrin)):
+                    lang = lang_opt
         if not lang:
-            if use_lang:
-                usrin = use_lang
-            elif use_input:  # if it's possible to read input from the console
-                # TODO End the use of use_input
-                usrin = fixins.input(
-                    "Choose a lang from these options: " + str(lang_options)
-                )
-            else:  # if such is not possible
-                raise MissingException(
-                    f"Could not auto-infer language from the languages {str(lang_options)}.",
-                    missing_thing="language_specification",
-                )
-            if usrin in lang_options:
-                lang = usrin
-            elif permit_abbrevs:
-                for lang_opt in lang_options:  # abbreviations
-                    if str.lower(lang_opt).startswith(str.lower(usrin)):
-                        lang = lang_opt
-            if not lang:
-                raise MissingException(
-                    f'Your input "{usrin}" is not recognized in the options {str(lang_options)}',
-                    missing_thing="language_section",
-                )
+            raise MissingException(
+                f'Your input "{usrin}" is not recognized in the options {str(lang_options)}',
+                missing_thing="language_section",
+            )
+    return lang
+
+
+def reduce_to_one_lang(
+    dom: List[Wikicode], use_lang: str = None, permit_abbrevs=True, use_input=True
+) -> Tuple[List[Wikicode], str]:
+    """
+    Returns sections of only 1 lang
+    """
+    # try to extract lang from dom
+    spans = index_langs(dom)
+    lang = choose_lang(
+        list(spans),
+        use_lang=use_lang,
+        permit_abbrevs=permit_abbrevs,
+        use_input=use_input,
+    )
 
     # me = word + "#" + lang
-    lang_secs = list(sections_by_lang(dom, lang))
+    start, end = spans[lang]
+    lang_secs = dom[start:end]
 
     if not lang_secs:
         raise MissingException(
@@ -79,6 +238,26 @@ def reduce_to_one_lang(
     return lang_secs, lang
 
 
+def index_langs(dom: List[Wikicode]) -> Dict[str, Tuple[int, int]]:
+    """
+    Indexes the lang sections of a page in one pass: lang -> (start, end), where dom[start:end] is
+    that lang's level 2 section and its subsections. Langs are in the order they appear on the page.
+    """
+    spans = OrderedDict()  # type: Dict[str, Tuple[int, int]]
+    lang, start = None, 0
+    for i, sec in enumerate(dom):
+        # every section but the lead starts with its heading, so nothing else of the section is looked at
+        heading = sec.nodes[0] if sec.nodes else None
+        if not isinstance(heading, Heading) or heading.level != 2:
+            continue
+        if lang is not None:
+            spans.setdefault(lang, (start, i))
+        lang, start = str(heading.title), i
+    if lang is not None:
+        spans.setdefault(lang, (start, len(dom)))
+    return spans
+
+
 def all_lang_sections(
     sections: List[Wikicode], recursive=False, flat=True
 ) -> Generator[Wikicode, None, None]:
@@ -0,0 +1,105 @@
+"""
+An index of a graph's nodes by their words, so that wikt_api.find_node_by_query() and find_node_by_origin()
+don't have to try every node of a big working graph against the query.
+It's kept in G.graph["node_index"], and catches up on the nodes added to G since it was last used.
+(The graphs only ever get nodes added. nx.compose() and G.copy() make new graphs, which get their own index.)
+
+Nodes are keyed by the same urlwords that moduleimpl.matches() compares, and the few candidates are then
+checked with moduleimpl.matches() itself, so the results are the same as trying every node.
+"""
+
+import itertools
+import weakref
+from typing import List, Dict, Tuple, Optional
+
+import networkx as nx
+
+import queryutils
+from emulate import moduleimpl
+from etyobjects import WordRelation, Originator
+
+
+def _urlword(word: str, langname: Optional[str]) -> str:
+    return moduleimpl.urlword(word, langname or None, warn=False)
+
+
+class NodeIndex:
+    def __init__(self, G: nx.DiGraph):
+        self._graph = weakref.ref(G)
+        self.n = 0  # how many of G's nodes are indexed
+        self.order = {}  # type: Dict[object, int] # node -> position in G.nodes
+        self.by_word = {}  # type: Dict[str, List[WordRelation]]
+        # urlword in the node's own lang -> nodes
+        self.by_urlword = {}  # type: Dict[str, List[WordRelation]]
+        # (urlword, langname) -> nodes, for the nodes with a lang
+        self.by_lang = {}  # type: Dict[Tuple[str, str], List[WordRelation]]
+        # nodes without a str word, which are always candidates
+        self.unkeyed = []  # type: List[WordRelation]
+
+    def __getstate__(self):
+        return {}  # an unpickled index doesn't know its graph, and gets rebuilt on use
+
+    def __setstate__(self, state):
+        self.__init__(nx.DiGraph())
+
+    def is_for(self, G: nx.DiGraph) -> bool:
+        return self._graph() is G and self.n <= len(G)
+
+    def update(self, G: nx.DiGraph):
+        if self.n == len(G):
+            return
+        for node in itertools.islice(G.nodes, self.n, None):
+            self.add(node)
+        self.n = len(G)
+
+    def add(self, node):
+        self.order[node] = len(self.order)
+        if isinstance(node, Originator):
+            return
+        if not isinstance(node, WordRelation):
+            raise ValueError(f"node has unexpected type {type(node)}")
+        if not isinstance(node.word, str):
+            self.unkeyed.append(node)
+            return
+        urlword = _urlword(node.word, node.langname)
+        self.by_word.setdefault(node.word, []).append(node)
+        self.by_urlword.setdefault(urlword, []).append(node)
+        if node.langname:
+            self.by_lang.setdefault((urlword, node.langname), []).append(node)
+
+    def candidates(self, word: str, langname: Optional[str]) -> List[WordRelation]:
+        """
+        Every node that might match the word and langname, in the order of G.nodes
+        """
+        if langname:
+            urlword = _urlword(word, langname)
+            found = list(self.by_lang.get((urlword, langname), ()))
+            # a node without a lang matches by word or by urlword
+            langless = self.by_word.get(word, []) + self.by_urlword.get(urlword, [])
+            found += [node for node in langless if not node.langname]
+        else:
+            found = self.by_word.get(word, []) + self.by_urlword.get(
+                _urlword(word, None), []
+            )
+        found += self.unkeyed
+        return sorted(set(found), key=self.order.__getitem__)
+
+
+def node_index(G: nx.DiGraph) -> NodeIndex:
+    index = G.graph.get("node_index")
+    if index is None or not index.is_for(G):
+        index = G.graph["node_index"] = NodeIndex(G)
+    index.update(G)
+    return index
+
+
+def find_nodes(G: nx.DiGraph, query: str, warn=False) -> List[WordRelation]:
+    """
+    Every node of G that matches the query (see WordRelation.matches_query()), in the order of G.nodes
+    """
+    word, biglang, _ = queryutils.query_to_qparts(query, warn)
+    return [
+        node
+        for node in node_index(G).candidates(word, biglang.langname)
+        if moduleimpl.matches(node.word, node.langname, word, biglang.langname)
+    ]
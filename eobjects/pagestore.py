@@ -0,0 +1,135 @@
+"""
+A local store of wikitext that can stand in for the Wiktionary API.
+See apiresult.go_offline()
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Optional, List, Iterable, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+
+def normalize_title(title: str) -> str:
+    """
+    Wiktionary titles are case sensitive, so the only thing to undo is url-style underscores.
+    ie. Reconstruction:Proto-West_Germanic/makōn -> Reconstruction:Proto-West Germanic/makōn
+    """
+    return title.replace("_", " ").strip()
+
+
+class PageStore:
+    def __init__(self, path: str):
+        """
+        path: sqlite database file. Created if it doesn't exist.
+        """
+        self.path = path
+        # sqlite connections can't be shared between threads
+        self._local = threading.local()
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    title TEXT PRIMARY KEY,
+                    pageid INTEGER NOT NULL DEFAULT 0,
+                    wikitext TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS categorymembers (
+                    category TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    PRIMARY KEY (category, title)
+                );
+                """)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def put_page(self, title: str, wikitext: str, pageid: int = 0):
+        self.put_pages([(title, wikitext, pageid)])
+
+    def put_pages(self, pages: Iterable[Tuple[str, str, int]]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (title, wikitext, pageid) VALUES (?, ?, ?)",
+                ((normalize_title(t), w, i) for t, w, i in pages),
+            )
+
+    def get_page(self, title: str) -> Optional[Tuple[str, int]]:
+        """
+        Returns (wikitext, pageid), or None if we don't have the page
+        """
+        row = self._conn.execute(
+            "SELECT wikitext, pageid FROM pages WHERE title = ?",
+            (normalize_title(title),),
+        ).fetchone()
+        return row
+
+    def put_category(self, category: str, titles: Iterable[str]):
+        category = normalize_title(category)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO categorymembers (category, title) VALUES (?, ?)",
+                ((category, normalize_title(t)) for t in titles),
+            )
+
+    def category_members(self, category: str, limit: int = 50) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT title FROM categorymembers WHERE category = ? ORDER BY title LIMIT ?",
+            (normalize_title(category), limit),
+        )
+        return [row[0] for row in rows]
+
+    def __contains__(self, title: str):
+        return self.get_page(title) is not None
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def answer(self, fullurl: str) -> str:
+        """
+        Returns the json text that the api would have returned for fullurl.
+        Supports action=parse (formatversion=2) and action=query&list=categorymembers,
+        which are the only two kinds of url that moduleimpl.to_link() generates.
+        """
+        params = parse_qs(urlsplit(fullurl).query)
+
+        def param(key, default=None):
+            return params[key][0] if key in params else default
+
+        action = param("action")
+        if action == "parse":
+            title = normalize_title(param("page", ""))
+            row = self.get_page(title)
+            if row is None:
+                jsn = {
+                    "error": {
+                        "code": "missingtitle",
+                        "info": "The page you specified doesn't exist.",
+                    }
+                }
+            else:
+                wikitext, pageid = row
+                jsn = {
+                    "parse": {"title": title, "pageid": pageid, "wikitext": wikitext}
+                }
+        elif action == "query" and param("list") == "categorymembers":
+            titles = self.category_members(
+                param("cmtitle", ""), int(param("cmlimit", 10))
+            )
+            jsn = {
+                "batchcomplete": "",
+                "query": {"categorymembers": [{"ns": 0, "title": t} for t in titles]},
+            }
+        else:
+            raise ValueError(f"Offline store can't answer url {fullurl}")
+        return json.dumps(jsn, ensure_ascii=False)
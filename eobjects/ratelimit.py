@@ -0,0 +1,152 @@
+"""
+Client-side politeness for Wiktionary fetches: a token bucket shared by every caller (threads and event loops alike),
+plus the backoff schedule for throttled requests.
+See https://www.mediawiki.org/wiki/API:Etiquette and https://www.mediawiki.org/wiki/Manual:Maxlag_parameter
+"""
+
+import asyncio
+import email.utils
+import json
+import random
+import threading
+import time
+from typing import Optional, Dict, Mapping
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# api error codes that go away if you wait
+RETRY_ERRORS = {"maxlag", "ratelimited", "readonly"}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either a number of seconds or an http date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_throttled(status: int, txt: str) -> bool:
+    if status in RETRY_STATUSES:
+        return True
+    if status == 200 and txt.startswith('{"error"'):
+        try:
+            return json.loads(txt)["error"].get("code") in RETRY_ERRORS
+        except (ValueError, KeyError, AttributeError):
+            return False
+    return False
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        maxlag: Optional[int] = 5,
+    ):
+        """
+        rate: requests per second, on average
+        burst: how many requests may go out back to back after a quiet spell
+        max_retries: how many times a throttled request is retried before giving up and returning it as is
+        base_delay, max_delay: the exponential backoff, used when the server doesn't send Retry-After
+        maxlag: sent with every request, so the api refuses us (instead of queueing us) when its replicas lag
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.maxlag = maxlag
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        self.waiting = 0  # queue depth: callers currently sleeping for a token
+        self.requests = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self) -> float:
+        """
+        Takes a token, and returns how many seconds the caller must wait before spending it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            wait = max(wait, self._paused_until - now)
+            self.requests += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+    async def aacquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+    def backoff(self, attempt: int, headers: Mapping[str, str]) -> float:
+        """
+        Schedules a retry for a throttled request: every caller is held back, not just this one,
+        since the server's complaint is about all of our traffic.
+        Returns the delay, for logging.
+        """
+        delay = parse_retry_after(headers.get("Retry-After"))
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * 2**attempt)
+            # jitter, so our retries don't arrive in lockstep
+            delay *= random.uniform(0.5, 1.0)
+        with self._lock:
+            self.retries += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    @property
+    def params(self) -> Dict[str, int]:
+        return {"maxlag": self.maxlag} if self.maxlag is not None else {}
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self.waiting,
+            "requests": self.requests,
+            "retries": self.retries,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "mean_wait": self.total_wait / self.requests if self.requests else 0.0,
+        }
@@ -0,0 +1,69 @@
+"""
+Request coalescing: while a fetch for some key is in flight, everyone else asking for that key
+waits on it and gets the same result (or the same exception) instead of sending their own.
+"""
+
+import asyncio
+import threading
+from typing import Callable, Any, Dict, Hashable, Awaitable
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None  # type: BaseException
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # type: Dict[Hashable, _Flight]
+        self.shared = 0  # calls that were answered by someone else's flight
+
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+
+class AsyncSingleFlight:
+    """
+    The event loop counterpart of SingleFlight. Flights are per loop, since tasks can't be awaited across loops.
+    """
+
+    def __init__(self):
+        self._tasks = {}  # type: Dict[Hashable, asyncio.Task]
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]):
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get((loop, key))
+        if task is None:
+            task = loop.create_task(fn())
+            self._tasks[(loop, key)] = task
+            task.add_done_callback(lambda _: self._tasks.pop((loop, key), None))
+        else:
+            self.shared += 1
+        # shielded, so that one caller being cancelled doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
@@ -0,0 +1,341 @@
+"""
+A streaming scanner for the templates in a section's wikitext, for when a whole mwparserfromhell tree is more than
+parse_and_graph() needs. It goes through the text once, yielding
+    str                 plain text
+    ScannedTemplate     {{templates}}, which quack like mwparserfromhell's Template (name, params, has(), get())
+    Markup              everything else: links, tags, ''styles'', list markers, comments, headings, entities, urls
+in the order mwparserfromhell's ifilter() would yield the equivalent nodes.
+Anything malformed or unclosed is treated as plain text.
+"""
+
+import re
+from typing import List, Generator, Union, Optional, Tuple
+
+
+class ScannedParam:
+    __slots__ = ("name", "value", "showkey")
+
+    def __init__(self, name: str, value: str, showkey: bool):
+        self.name = name
+        self.value = value
+        self.showkey = showkey
+
+    def __str__(self):
+        # as with mwparserfromhell's Parameter, a named parameter prints with its name
+        return self.name + "=" + self.value if self.showkey else self.value
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+class ScannedTemplate:
+    __slots__ = ("raw", "name", "params")
+
+    def __init__(self, raw: str, name: str, params: List[ScannedParam]):
+        self.raw = raw
+        self.name = name
+        self.params = params
+
+    def has(self, name: str, ignore_empty=False) -> bool:
+        name = str(name).strip()
+        for param in self.params:
+            if param.name.strip() == name:
+                if ignore_empty and not param.value.strip():
+                    continue
+                return True
+        return False
+
+    def get(self, name: str) -> ScannedParam:
+        name = str(name).strip()
+        for param in reversed(self.params):  # the last one wins, as in MediaWiki
+            if param.name.strip() == name:
+                return param
+        raise ValueError(name)
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return repr(self.raw)
+
+
+class Markup:
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+    def __contains__(self, item):
+        return item in self.raw
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return repr(self.raw)
+
+
+Node = Union[str, ScannedTemplate, Markup]
+
+# Where something other than plain text might start
+_special = re.compile(
+    r"\{\{|\[|<|&|''|(?:https?|ftp)://|(?<![^\n])[=*#:;-]", re.IGNORECASE
+)
+_heading = re.compile(r"(={1,6})[^\n]*?[^=\n]\1[ \t]*(?=\n|$)")
+_list_markers = "*#:;"
+_hr = re.compile(r"-{4,}")
+# ''italics'', '''bold''' or '''''bold italics''''', closed on the same line
+_style = re.compile(r"('{5}|'{3}|'{2})(?!')[^\n]*?(?<!')\1(?!')")
+_entity = re.compile(r"&(?:[a-zA-Z][a-zA-Z0-9]*|#[0-9]+|#[xX][0-9a-fA-F]+);")
+_url = re.compile(r"(?:https?|ftp)://[^\s\[\]<>\"{}|]+", re.IGNORECASE)
+_ext_link = re.compile(r"\[(?:https?:|ftp:)?//[^\]\n]*\]", re.IGNORECASE)
+_tag_open = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)(?:\s[^<>]*?)?(/?)>")
+_single_tags = {"br", "hr", "wbr", "img"}
+_unparsed_tags = {"nowiki", "pre", "math", "syntaxhighlight", "source"}
+
+
+def _skip_comment(text: str, i: int) -> Optional[int]:
+    end = text.find("-->", i + 4)
+    return None if end == -1 else end + 3
+
+
+def _skip_braces(text: str, i: int) -> Optional[int]:
+    """
+    From the {{ at i, returns the index just after its matching }}, skipping over nested templates, links and
+    comments. Returns None if it's never closed.
+    """
+    depth = 0
+    j = i
+    n = len(text)
+    while j < n:
+        if text.startswith("{{", j):
+            depth += 1
+            j += 2
+        elif text.startswith("}}", j):
+            depth -= 1
+            j += 2
+            if depth == 0:
+                return j
+        elif text.startswith("[[", j):
+            end = _skip_link(text, j)
+            j = end if end is not None else j + 2
+        elif text.startswith("<!--", j):
+            end = _skip_comment(text, j)
+            if end is None:
+                return None
+            j = end
+        else:
+            j += 1
+    return None
+
+
+def _skip_link(text: str, i: int) -> Optional[int]:
+    """
+    From the [[ at i, returns the index just after its matching ]]. Returns None if it's never closed.
+    """
+    depth = 0
+    j = i
+    n = len(text)
+    while j < n:
+        if text.startswith("[[", j):
+            depth += 1
+            j += 2
+        elif text.startswith("]]", j):
+            depth -= 1
+            j += 2
+            if depth == 0:
+                return j
+        elif text.startswith("{{", j):
+            end = _skip_braces(text, j)
+            j = end if end is not None else j + 2
+        elif text.startswith("<!--", j):
+            end = _skip_comment(text, j)
+            if end is None:
+                return None
+            j = end
+        else:
+            j += 1
+    return None
+
+
+def _skip_tag(text: str, i: int) -> Optional[int]:
+    m = _tag_open.match(text, i)
+    if not m:
+        return None
+    name = m.group(1).lower()
+    if m.group(2) or name in _single_tags:
+        return m.end()
+    close = re.compile(r"</" + re.escape(name) + r"\s*>", re.IGNORECASE).search(
+        text, m.end()
+    )
+    return None if close is None else close.end()
+
+
+def _split_top_level(inner: str) -> List[str]:
+    """
+    Splits a template's insides on the |s that aren't inside of a nested template, link or comment.
+    """
+    pieces = []
+    start = j = 0
+    n = len(inner)
+    while j < n:
+        if inner.startswith("{{", j):
+            end = _skip_braces(inner, j)
+            j = end if end is not None else j + 2
+        elif inner.startswith("[[", j):
+            end = _skip_link(inner, j)
+            j = end if end is not None else j + 2
+        elif inner.startswith("<!--", j):
+            end = _skip_comment(inner, j)
+            j = end if end is not None else n
+        elif inner[j] == "|":
+            pieces.append(inner[start:j])
+            j += 1
+            start = j
+        else:
+            j += 1
+    pieces.append(inner[start:])
+    return pieces
+
+
+def _top_level_index(piece: str, char: str) -> int:
+    for j, c in enumerate(piece):
+        if c == char:
+            return j
+        if c in "{[<":
+            return -1  # an = after a nested template or link isn't a key
+    return -1
+
+
+def _make_template(raw: str) -> Optional[ScannedTemplate]:
+    pieces = _split_top_level(raw[2:-2])
+    name = pieces[0]
+    if not name.strip() or "{" in name or "[" in name:
+        return None  # mwparserfromhell wouldn't call this a template either
+    params = []
+    default = 1
+    for piece in pieces[1:]:
+        eq = _top_level_index(piece, "=")
+        if eq == -1:
+            params.append(ScannedParam(str(default), piece, False))
+            default += 1
+        else:
+            params.append(ScannedParam(piece[:eq], piece[eq + 1 :], True))
+    return ScannedTemplate(raw, name, params)
+
+
+def _next_node(text: str, i: int) -> Tuple[Optional[Node], int]:
+    """
+    Tries to read a non-text node at i. Returns (node, end), or (None, i) if there's only text there.
+    """
+    if text.startswith("{{{", i):
+        end = _skip_braces(text, i + 1)
+        if end is not None and text.startswith("}", end):
+            return Markup(text[i : end + 1]), end + 1  # a {{{template argument}}}
+    if text.startswith("{{", i):
+        end = _skip_braces(text, i)
+        if end is not None:
+            template = _make_template(text[i:end])
+            if template is not None:
+                return template, end
+        return None, i
+    if text.startswith("[[", i):
+        end = _skip_link(text, i)
+        return (Markup(text[i:end]), end) if end is not None else (None, i)
+    if text.startswith("[", i):
+        m = _ext_link.match(text, i)
+        return (Markup(m.group()), m.end()) if m else (None, i)
+    if text.startswith("<!--", i):
+        end = _skip_comment(text, i)
+        return (Markup(text[i:end]), end) if end is not None else (None, i)
+    if text.startswith("<", i):
+        end = _skip_tag(text, i)
+        return (Markup(text[i:end]), end) if end is not None else (None, i)
+    if text.startswith("&", i):
+        m = _entity.match(text, i)
+        return (Markup(m.group()), m.end()) if m else (None, i)
+    if text.startswith("=", i):
+        m = _heading.match(text, i)
+        return (Markup(m.group()), m.end()) if m else (None, i)
+    if text[i] in _list_markers:
+        return Markup(text[i]), i + 1  # a list marker at the start of a line
+    if text.startswith("----", i):
+        m = _hr.match(text, i)
+        return Markup(m.group()), m.end()
+    if text.startswith("''", i):
+        m = _style.match(text, i)
+        return (Markup(m.group()), m.end()) if m else (None, i)
+    m = _url.match(text, i)
+    if m:
+        url = m.group()
+        # trailing punctuation belongs to the sentence, not the url
+        stripped = url.rstrip(",;.:!?")
+        if stripped.endswith(")") and "(" not in stripped:
+            stripped = stripped.rstrip(")")
+        return Markup(stripped), i + len(stripped)
+    return None, i
+
+
+def scan(text: str) -> Generator[Node, None, None]:
+    """
+    Yields the top level nodes of text, like Wikicode.ifilter(recursive=False).
+    Adjacent plain text is yielded as one str.
+    """
+    i = 0
+    buf_start = 0
+    n = len(text)
+    while i < n:
+        m = _special.search(text, i)
+        if not m:
+            break
+        node, end = _next_node(text, m.start())
+        if node is None:
+            i = m.start() + 1
+            continue
+        if m.start() > buf_start:
+            yield text[buf_start : m.start()]
+        yield node
+        i = buf_start = end
+        if isinstance(node, Markup) and node.raw in _list_markers:
+            # nested lists: the rest of the run of markers (ie. "#:*") are markers too
+            while i < n and text[i] in _list_markers:
+                yield Markup(text[i])
+                i = buf_start = i + 1
+    if buf_start < n:
+        yield text[buf_start:]
+
+
+def iter_templates(text: str) -> Generator[ScannedTemplate, None, None]:
+    """
+    Yields every template in text, nested ones included, like Wikicode.ifilter_templates(recursive=True):
+    each template comes before the templates inside of it.
+    """
+    for node in scan(text):
+        if isinstance(node, ScannedTemplate):
+            yield node
+            yield from iter_templates(node.name)
+            for param in node.params:
+                if param.showkey:
+                    yield from iter_templates(param.name)
+                yield from iter_templates(param.value)
+        elif isinstance(node, Markup) and not node.raw.startswith("<!--"):
+            inner = _markup_inner(node.raw)
+            if inner:
+                yield from iter_templates(inner)
+
+
+def _markup_inner(raw: str) -> str:
+    if raw.startswith("[["):
+        return raw[2:-2]
+    if raw.startswith("{{{"):
+        return raw[3:-3]
+    if raw.startswith("["):
+        return raw[1:-1]
+    if raw.startswith("<"):
+        m = _tag_open.match(raw)
+        if m and m.group(1).lower() not in _unparsed_tags:
+            return raw[m.end() :]
+        return ""
+    if raw.startswith("="):
+        return raw.strip().strip("=")
+    return ""
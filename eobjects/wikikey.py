@@ -52,12 +52,21 @@ class WikiKey:
             self.result = APIResult(self.fullurl)
         return self.result
 
-    def load_wikitext(self, infer_lang=True, override_lang=False):
+    async def aload_result(self):
+        """
+        Async counterpart of load_result(), fetching with APIResult.afetch()
+        """
+        assert not self.result  # make sure that we aren't duplicating results
+        self.result = await APIResult.afetch(self.fullurl)
+        return self.result
+
+    def load_wikitext(self, infer_lang=True, override_lang=False, raw=False):
         """
         if infer_lang=True, you are guaranteed a lang at the end
+        raw=True leaves the page unparsed (see apiresult.parse_json())
         """
         self.result.load_wikitext(
-            self, infer_lang=infer_lang, override_lang=override_lang
+            self, infer_lang=infer_lang, override_lang=override_lang, raw=raw
         )
 
     def __bool__(self):
@@ -1,4 +1,5 @@
 import string
+import sys
 import warnings
 from typing import Any
 
@@ -10,7 +11,7 @@ from mwparserfromhell.nodes import Template
 import queryobjects
 import queryutils
 from langcode import langcodes
-from emulate import moduleimpl
+from emulate import moduleimpl, template2url
 
 
 @property
@@ -71,9 +72,12 @@ class Originator:
 
 
 class Affixal:
+    __slots__ = ("raw", "root")
+
     def __init__(self, template: mwparserfromhell.wikicode.Template, rtype: string):
-        params = template.params
-        self.template = template
+        self.raw = sys.intern(
+            str(template)
+        )  # rather than the template, which holds onto its page's tree
         if rtype == "pre":
             self.root = str(template.get("3"))  # params[2] lua has 1-indexed arrays
         elif rtype == "suf":
@@ -84,7 +88,30 @@ class Affixal:
             # TODO: Everything
 
 
+def _intern(s):
+    return sys.intern(str(s)) if s is not None else None
+
+
 class WordRelation:
+    """
+    The nodes of a graph, of which there can be many thousands: so they have __slots__, their strings are interned,
+    and the template's params are kept as a tuple of strs, not as the parsed Parameters of the page.
+    """
+
+    __slots__ = (
+        "origin",
+        "params",
+        "rtype",
+        "langcode",
+        "langname",
+        "word",
+        "null",
+        "affixal",
+        "_selflang",
+        "_selflangname",
+        "_key",
+    )
+
     def matches_query(
         self, me: str, strict=False, ultra_strict=False, warn=False
     ) -> bool:
@@ -97,7 +124,7 @@ class WordRelation:
             strict=strict,
             ultra_strict=ultra_strict,
         )
-        # TODO: NOT iterate through entire graph when trying to find a match
+        # to find the matching nodes of a graph, see eobjects.nodeindex
 
     @property
     def o_id(self):
@@ -106,20 +133,55 @@ class WordRelation:
     def __bool__(self):
         return not self.null
 
+    @property
+    def key(self):
+        """
+        What identifies the node: (kind of relation, langcode, word as its entry is titled), so that the same word
+        found twice, or by two queries, is one node. None for a null relation or one without a word,
+        which only equals itself.
+        """
+        try:
+            return self._key
+        except AttributeError:
+            pass
+        if self.null or self.word is None:
+            key = None
+        else:
+            key = (
+                type(self).__name__,
+                self.langcode,
+                template2url.keyword(self.word, self.langname),
+            )
+        self._key = key
+        return key
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.key is not None and self.key == other.key
+
+    def __hash__(self):
+        key = self.key
+        return object.__hash__(self) if key is None else hash(key)
+
     def __init__(self, params, rtype, langcode, word, _selflang=None):
-        self.params = params
-        self.rtype = rtype
-        self.langcode = langcode
-        self.langname = langcodes.name(langcode, use_ety=True, use_fam=True)
+        self.params = tuple(_intern(param) for param in params)
+        self.rtype = _intern(rtype)
+        self.langcode = _intern(langcode)
+        self.langname = _intern(langcodes.name(langcode, use_ety=True, use_fam=True))
         if langcode and not self.langname:
             print(f"{langcode} is None")
-        self.word = word
+        self.word = _intern(word)
         if _selflang:
-            self._selflang = _selflang
-            self._selflangname = langcodes.name(_selflang)
+            self._selflang = _intern(_selflang)
+            self._selflangname = _intern(langcodes.name(_selflang))
 
 
 class EtyRelation(WordRelation):
+    __slots__ = ()
+
     ety_abbrs = {
         "derived": "der",
         "inherited": "inh",
@@ -204,12 +266,12 @@ class EtyRelation(WordRelation):
 
     def __str__(self):
         if not self:
-            return "{{" + self.rtype + " null " + repr(self.params) + "}}"
+            return "{{" + self.rtype + " null " + repr(list(self.params)) + "}}"
         if self.affixal:
-            return str(self.affixal.template)
+            return self.affixal.raw
         assert self.word is not None
         assert self.langname is not None
-        paramsc = repr(self.params[3:])  # slice off the first 3 args
+        paramsc = repr(list(self.params[3:]))  # slice off the first 3 args
         paramsc = "" if paramsc == "[]" else " " + paramsc  # convert []s to ""
 
         return "{" + self.rtype + "|" + self.langname + "|" + self.word + paramsc + "}"
@@ -219,6 +281,7 @@ class EtyRelation(WordRelation):
 
 
 class LemmaRelation(WordRelation):
+    __slots__ = ()
 
     def __init__(
         self, origin: Originator, template: mwparserfromhell.wikicode.Template
@@ -266,10 +329,10 @@ class LemmaRelation(WordRelation):
 
     def __str__(self):
         if not self:
-            return "L{{" + self.rtype + " null " + repr(self.params) + "}}"
+            return "L{{" + self.rtype + " null " + repr(list(self.params)) + "}}"
         assert self.word is not None
         assert self.langname is not None
-        paramsc = repr(self.params[2:])  # slice off the first 2 args
+        paramsc = repr(list(self.params[2:]))  # slice off the first 2 args
         paramsc = "" if paramsc == "[]" else " " + paramsc  # convert []s to ""
 
         return (
@@ -280,11 +343,10 @@ class LemmaRelation(WordRelation):
     def __repr__(self):
         return "$" + str(self.origin.o_id) + str(self)
 
-    # def __eq__(self, other): This must be made compatable with __hash__() to work w/ nx - not worth it
-    #     return self.__repr__() == other.__repr__()
-
 
 class DescentRelation(WordRelation):
+    __slots__ = ()
+
     desc_abbrs = {
         "descendant": "desc",
         "see descendants": "see desc",
@@ -303,10 +365,11 @@ class DescentRelation(WordRelation):
 
         if query_opt:
             word, _Lang, qflags = queryutils.query_to_qparts(query_opt)
-            self.word = word
+            self.word = _intern(word)
+            self.langcode = _Lang.langcode
             self.langname = _Lang.langname
             self.rtype = "custom"
-            self.params = []
+            self.params = ()
             self.null = False
             self.affixal = None
             return
@@ -338,12 +401,12 @@ class DescentRelation(WordRelation):
 
     def __str__(self):
         if not self:
-            return "#{{" + self.rtype + " null " + repr(self.params) + "}}"
+            return "#{{" + self.rtype + " null " + repr(list(self.params)) + "}}"
         if self.affixal:
-            return str(self.affixal.template)
+            return self.affixal.raw
         assert self.word is not None
         assert self.langname is not None
-        paramsc = repr(self.params[3:])  # slice off the first 3 args
+        paramsc = repr(list(self.params[3:]))  # slice off the first 3 args
         paramsc = "" if paramsc == "[]" else " " + paramsc  # convert []s to ""
 
         return "#{" + self.rtype + "|" + self.langname + "|" + self.word + paramsc + "}"
@@ -0,0 +1,202 @@
+"""
+The language, etymology language and family code tables (gencodes, etycodes, famcodes) in one compact file,
+codetable.tsv, of lines sorted by kind and code. It's read on the first lookup, and looked up by binary search,
+so only the rows that are asked for are ever parsed. Importing the python tables themselves takes a while,
+since each is a module of thousands of dict literals.
+Regenerate codetable.tsv after editing any of those tables:
+    python -m langcode.codetable
+"""
+
+import bisect
+import os
+import threading
+from collections import namedtuple
+from typing import Optional, List, Iterator, Tuple, Dict
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "codetable.tsv")
+
+GEN = "gen"  # gencodes: langs
+ETY = "ety"  # etycodes: etymology-only langs, ie. varieties
+FAM = "fam"  # famcodes: families
+
+# aliases include the otherNames and varieties of the original tables.
+# reconstr: whether the lang is reconstructed, so that its entries are under Reconstruction:
+CodeRow = namedtuple(
+    "CodeRow", ["name", "aliases", "parent", "family", "proto", "reconstr"]
+)
+
+_COLUMNS = ("kind", "code") + CodeRow._fields
+_SEP = "|"  # between aliases
+
+_lines = None  # type: Optional[List[str]]
+_lock = threading.Lock()
+
+
+def _table() -> List[str]:
+    global _lines
+    if _lines is None:
+        with _lock:
+            if _lines is None:
+                _lines = load()
+    return _lines
+
+
+def load(path: str = TABLE_PATH) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    header = lines[0].split("\t")
+    assert tuple(header) == _COLUMNS, f"{path} has unexpected columns {header}"
+    # the key of every line is "kind\tcode\t", and the lines are sorted by it, so they can be bisected
+    return [line for line in lines[1:] if line]
+
+
+def _parse(line: str) -> Tuple[str, CodeRow]:
+    _, code, name, aliases, parent, family, proto, reconstr = line.split("\t")
+    return code, CodeRow(
+        name,
+        tuple(aliases.split(_SEP)) if aliases else (),
+        parent or None,
+        family or None,
+        proto or None,
+        reconstr == "1",
+    )
+
+
+def get(kind: str, code: str) -> Optional[CodeRow]:
+    """
+    The row for a code of one of GEN, ETY or FAM, or None
+    """
+    if code is None:
+        return None
+    lines = _table()
+    key = kind + "\t" + str(code) + "\t"
+    i = bisect.bisect_left(lines, key)
+    if i < len(lines) and lines[i].startswith(key):
+        return _parse(lines[i])[1]
+    return None
+
+
+def items(kind: str) -> Iterator[Tuple[str, CodeRow]]:
+    """
+    Every (code, row) of one kind, sorted by code
+    """
+    lines = _table()
+    i = bisect.bisect_left(lines, kind + "\t")
+    while i < len(lines) and lines[i].startswith(kind + "\t"):
+        yield _parse(lines[i])
+        i += 1
+
+
+_KINDS = (GEN, ETY, FAM)  # in order of precedence, as in langcodes.name()
+# casefolded name or alias -> [(kind, code, is alias)], canonical names first, then by kind, then legacy codes last
+_names = None  # type: Optional[Dict[str, List[Tuple[str, str, bool]]]]
+_name_keys = None  # type: Optional[List[str]] # the same, sorted, for prefix lookups
+
+
+def _is_legacy(code: str, name: str) -> bool:
+    """
+    Whether code is one of etycodes' old abbreviations or placeholders (ie. "VL.", "LL", "American English", "Koine"),
+    which share their name with the code that templates actually use (ie. "la-vul", "la-lat", "en-US", "grc-koi")
+    """
+    return "." in code or " " in code or code == name or code[0].isupper()
+
+
+def _name_index() -> Dict[str, List[Tuple[str, str, bool]]]:
+    global _names, _name_keys
+    if _names is None:
+        lines = _table()
+        with _lock:
+            if _names is None:
+                names = {}
+                legacy = set()
+                for line in lines:
+                    kind, code, name, aliases, _ = line.split("\t", 4)
+                    names.setdefault(name.casefold(), []).append((kind, code, False))
+                    for alias in aliases.split(_SEP) if aliases else ():
+                        names.setdefault(alias.casefold(), []).append(
+                            (kind, code, True)
+                        )
+                    if _is_legacy(code, name):
+                        legacy.add(code)
+                for entries in names.values():
+                    entries.sort(
+                        key=lambda e: (e[2], _KINDS.index(e[0]), e[1] in legacy)
+                    )
+                _name_keys = sorted(names)
+                _names = names
+    return _names
+
+
+def by_name(name: str, kinds=_KINDS) -> List[Tuple[str, str, bool]]:
+    """
+    (kind, code, is alias) of everything of those kinds with that name or alias, ignoring case. Best match first.
+    """
+    return [e for e in _name_index().get(name.casefold(), ()) if e[0] in kinds]
+
+
+def by_name_prefix(prefix: str, kinds=_KINDS) -> Iterator[Tuple[str, str, str, bool]]:
+    """
+    (name, kind, code, is alias) of everything of those kinds with a name or alias starting with prefix, ignoring case.
+    Sorted by name (casefolded).
+    """
+    names = _name_index()
+    prefix = prefix.casefold()
+    i = bisect.bisect_left(_name_keys, prefix)
+    while i < len(_name_keys) and _name_keys[i].startswith(prefix):
+        for kind, code, is_alias in names[_name_keys[i]]:
+            if kind in kinds:
+                yield _name_keys[i], kind, code, is_alias
+        i += 1
+
+
+def _is_reconstr(code: str, name: str) -> bool:
+    # Wiktionary's reconstructed langs are its proto-languages, which are consistently both coded and named so.
+    # Attested langs with some reconstructed terms (ie. Old English) aren't reconstructed langs.
+    return code.endswith("-pro") or name.startswith("Proto-")
+
+
+def _rows_from_modules():
+    # the only place the python tables get imported
+    from langcode import gencodes, etycodes, famcodes
+
+    for code, name in gencodes.m.items():
+        yield GEN, code, CodeRow(name, (), None, None, None, _is_reconstr(code, name))
+    for kind, m in ((ETY, etycodes.m), (FAM, famcodes.m)):
+        for code, d in m.items():
+            d = {k.strip(): v for k, v in d.items()}  # one etycode has a "\tparent"
+            aliases = (
+                set(d.get("aliases") or ())
+                | set(d.get("otherNames") or ())
+                | set(d.get("varieties") or ())
+            )
+            yield kind, code, CodeRow(
+                d["canonicalName"],
+                tuple(sorted(aliases)),
+                d.get("parent"),
+                d.get("family"),
+                d.get("protoLanguage"),
+                kind == ETY and _is_reconstr(code, d["canonicalName"]),
+            )
+
+
+def generate(path: str = TABLE_PATH):
+    lines = []
+    for kind, code, row in _rows_from_modules():
+        fields = [kind, code, row.name, _SEP.join(row.aliases)]
+        fields += [x or "" for x in (row.parent, row.family, row.proto)]
+        fields.append("1" if row.reconstr else "")
+        assert not any("\t" in x or "\n" in x for x in fields)
+        assert not any(_SEP in alias for alias in row.aliases)
+        lines.append("\t".join(fields))
+    lines.sort(key=lambda line: line[: line.index("\t", line.index("\t") + 1) + 1])
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\t".join(_COLUMNS) + "\n")
+        for line in lines:
+            f.write(line + "\n")
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    generate()
+    print(f"Wrote {TABLE_PATH}")
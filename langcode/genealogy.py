@@ -0,0 +1,95 @@
+"""
+The genealogy of langs, as a DAG of codes with edges from parent to child, built on first use from the code table:
+    etycodes "parent"           a variety descends from its parent lang, ie. la -> la-vul
+    famcodes "family"           a family belongs to its parent family, ie. roa -> roa-oil
+    famcodes "protoLanguage"    a family descends from its proto-language, ie. la -> roa
+gencodes has no ancestry in it, so langs like English (en) or Old French (fro) are only connected if one
+of the above mentions them.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import networkx as nx
+
+from langcode import codetable, langcodes
+
+_G = None  # type: Optional[nx.DiGraph]
+_lock = threading.Lock()
+
+
+def graph() -> nx.DiGraph:
+    global _G
+    if _G is None:
+        with _lock:
+            if _G is None:
+                G = nx.DiGraph()
+                for kind in (codetable.ETY, codetable.FAM):
+                    for code, row in codetable.items(kind):
+                        G.add_node(code)
+                        for parent in (row.parent, row.family, row.proto):
+                            if parent and parent != code:  # qfa-not is its own family
+                                G.add_edge(parent, code)
+                assert nx.is_directed_acyclic_graph(G)
+                _G = G
+    return _G
+
+
+@lru_cache(maxsize=None)
+def ancestors(code: str) -> Tuple[str, ...]:
+    """
+    Every ancestor of a code, nearest first
+    """
+    G = graph()
+    if code not in G:
+        return ()
+    found = []
+    frontier = [code]
+    seen = {code}
+    while frontier:
+        nxt = []
+        for c in frontier:
+            for parent in sorted(G.predecessors(c)):
+                if parent not in seen:
+                    seen.add(parent)
+                    found.append(parent)
+                    nxt.append(parent)
+        frontier = nxt
+    return tuple(found)
+
+
+@lru_cache(maxsize=None)
+def descendants(code: str) -> Tuple[str, ...]:
+    G = graph()
+    if code not in G:
+        return ()
+    return tuple(sorted(nx.descendants(G, code)))
+
+
+@lru_cache(maxsize=None)
+def common_ancestor(code1: str, code2: str) -> Optional[str]:
+    """
+    The lowest common ancestor of two codes, which may be one of them. None if they aren't related.
+    """
+    G = graph()
+    if code1 not in G or code2 not in G:
+        return code1 if code1 == code2 else None
+    return nx.lowest_common_ancestor(G, code1, code2)
+
+
+@lru_cache(maxsize=None)
+def lineage(*langnames: str) -> Tuple[str, ...]:
+    """
+    The langnames given, followed by the names of all of their known ancestors. Names that aren't known are kept as is.
+    """
+    names = list(dict.fromkeys(langnames))
+    for langname in langnames:
+        code = langcodes.code(langname, use_ety=True, use_fam=True)
+        if code is None:
+            continue
+        for ancestor in ancestors(code):
+            name = langcodes.name(ancestor, use_ety=True, use_fam=True)
+            if name and name not in names:
+                names.append(name)
+    return tuple(names)
@@ -1,21 +1,72 @@
-import warnings
+from functools import lru_cache
+from typing import List, Tuple
 
-from langcode import famcodes, etycodes, gencodes
+from langcode import codetable
 
 
 def name(code, use_ety=False, use_fam=False) -> str:
-    val = gencodes.m.get(code, None)
-    if val is None and use_ety:
-        dict = etycodes.m.get(code, None)
-        if dict is not None:
-            val = dict["canonicalName"]
-    if val is None and use_fam:
-        dict = famcodes.m.get(code, None)
-        if dict is not None:
-            val = dict["canonicalName"]
-    return val
+    row = codetable.get(codetable.GEN, code)
+    if row is None and use_ety:
+        row = codetable.get(codetable.ETY, code)
+    if row is None and use_fam:
+        row = codetable.get(codetable.FAM, code)
+    return None if row is None else row.name
 
 
+def _kinds(use_ety: bool, use_fam: bool):
+    return (
+        (codetable.GEN,)
+        + ((codetable.ETY,) if use_ety else ())
+        + ((codetable.FAM,) if use_fam else ())
+    )
+
+
+def code(langname, use_ety=False, use_fam=False) -> str:
+    """
+    The reverse of name(): ignores case, and knows aliases too (ie. "gheg" -> "aln", with use_ety).
+    Canonical names win over aliases, then langs over etymology langs over families.
+    """
+    if not langname:
+        return None
+    found = codetable.by_name(langname, _kinds(use_ety, use_fam))
+    return found[0][1] if found else None
+
+
+def codes_by_prefix(prefix, use_ety=False, use_fam=False) -> List[Tuple[str, str]]:
+    """
+    (canonical name, code) of every lang whose name or an alias starts with prefix, ignoring case.
+    ie. for completing a partly typed langname
+    """
+    found = []
+    seen = set()
+    for _, kind, c, _ in codetable.by_name_prefix(prefix, _kinds(use_ety, use_fam)):
+        if (kind, c) not in seen:
+            seen.add((kind, c))
+            found.append((codetable.get(kind, c).name, c))
+    return found
+
+
+@lru_cache(maxsize=None)
 def is_reconstr(code) -> bool:
-    warnings.warn("is_reconstr USES FLAWED LOGIC")
-    return code[-4:] == "-pro"  # TODO: Extremely flawed - See Old English
+    """
+    Whether a lang (or etymology lang) is reconstructed, ie. its entries are under Reconstruction:
+    That's the proto-languages, and not, say, Old English, even though it has reconstructed terms too.
+    """
+    row = codetable.get(codetable.GEN, code) or codetable.get(codetable.ETY, code)
+    if row is None:
+        return bool(code) and code.endswith(
+            "-pro"
+        )  # by the same rule as the code table
+    return row.reconstr
+
+
+def is_reconstr_name(langname) -> bool:
+    """
+    is_reconstr(), by name or alias. Unknown names are judged by the same rule as the code table: Proto-*
+    """
+    if not langname:
+        return False
+    found = code(langname, use_ety=True)
+    if found is None:
+        return langname.startswith("Proto-")
+    return is_reconstr(found)
@@ -4,6 +4,9 @@ According to https://en.wiktionary.org/wiki/Wiktionary:Entry_layout#Part_of_spee
 Includes and encapsulates "POS"
 
 """
+import re
+from typing import Union, Optional, Tuple
+
 from mwparserfromhell.wikicode import Wikicode
 
 pos = ["Adjective", "Adverb", "Ambiposition", "Article", "Circumposition", "Classifier", "Conjunction", "Contraction",
@@ -22,6 +25,30 @@ romanization = ["Romanization"]
 
 all = pos + morphemes + symbols + phrases + hanzi + romanization
 
-def is_defn(wc: Wikicode):
-
-    return any(wc.startswith("===" + x) for x in all) or any(wc.startswith("====" + x) for x in all)  #TODO: support lvl5 headers
+# "===Verb===", "====Etymology 2====", etc: the level, then the header type, which is either
+# Etymology (with its index, if there are several), a definition header, or anything else.
+_header = re.compile(r"(={3,5})(?!=)(?:(Etymology)(?: ([0-9]+))?|(" + "|".join(re.escape(x) for x in sorted(all, key=len, reverse=True)) + r")|(.+?))\1")
+
+
+def classify(header: Union[str, Wikicode]) -> Optional[Tuple[int, str, Optional[int], bool]]:
+    """
+    Classifies a level 3 to 5 header in one go: (level, header type, etymology index, is definition)
+    ie. "===Etymology 2===" -> (3, "Etymology", 2, False), "====Proper noun====" -> (4, "Proper noun", None, True)
+    Only the heading is looked at, so a whole section can be passed. Returns None if it doesn't start with a header.
+    """
+    if isinstance(header, Wikicode):
+        header = str(header.nodes[0]) if header.nodes else ""
+    m = _header.match(header)
+    if not m:
+        return None
+    lvl, ety, idx, defn, other = m.groups()
+    if ety:
+        return len(lvl), ety, None if idx is None else int(idx), False
+    if defn:
+        return len(lvl), defn, None, True
+    return len(lvl), other, None, False
+
+
+def is_defn(wc: Union[str, Wikicode]):
+    classified = classify(wc)
+    return classified is not None and classified[3]
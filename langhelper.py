@@ -1,109 +1,136 @@
 import warnings
+import weakref
+from functools import lru_cache
 
 from langcode import langcodes
 
+# (langcode, langname, reconstr) -> Language. Weak, so that the Languages of one-off queries don't pile up
+_interned = weakref.WeakValueDictionary()
+
+
+def _intern(langcode, langname, reconstr) -> "Language":
+    reconstr = bool(reconstr)
+    key = (langcode, langname, reconstr)
+    Lang = _interned.get(key)
+    if Lang is None:
+        Lang = object.__new__(Language)
+        object.__setattr__(Lang, "langcode", langcode)
+        object.__setattr__(Lang, "langname", langname)
+        object.__setattr__(Lang, "reconstr", reconstr)
+        object.__setattr__(
+            Lang, "langqstr", ("R:" + langname) if reconstr and langname else langname
+        )
+        Lang = _interned.setdefault(key, Lang)
+    return Lang
+
+
+@lru_cache(maxsize=4096)
+def _from_args(langcode, langname, langqstr, is_reconstr, warn) -> "Language":
+    # constructor args are as typed by the user, so they're remembered in a bounded cache, as in query_to_qparts()
+    return _intern(*Language._resolve(langcode, langname, langqstr, is_reconstr, warn))
+
 
 class Language:
-    def __init__(
-        self,
+    """
+    An immutable, interned value: constructing the same language twice gives the same object,
+    so Languages can key dicts and sets, and compare by identity.
+    """
+
+    __slots__ = ("langcode", "langname", "reconstr", "langqstr", "__weakref__")
+
+    def __new__(
+        cls,
         langcode: str = None,
         langname: str = None,
         langqstr: str = None,
-        is_reconstr: bool = False,
+        is_reconstr: bool = None,
         warn=True,
     ):
         """
         langcode: Wikt Language Code            ie. es, ine-pro
         langname: Name of Language              ie. Spanish, Proto-Indo-European
         langqstr: Query string for language     ie. Spanish, R:Proto-Indo-European
-
-        WARNING: Reconstruction assumption only works one way!
+        is_reconstr: Whether the lang is reconstructed. If not given, it's looked up in the code table:
         langqstr                                Proto-Indo-European -> R:Proto-Indo-European
-        BUT
-        langqstr                                Old English does not get inferred!
+        langqstr                                Old English -> Old English (it has reconstructed terms, but isn't a
+                                                reconstructed lang)
+        """
+        return _from_args(langcode, langname, langqstr, is_reconstr, warn)
+
+    @staticmethod
+    def _resolve(langcode, langname, langqstr, is_reconstr, warn=True):
+        """
+        (langcode, langname, reconstr), from whichever of them we're given
         """
         analyze_lname = False
         if langcode:  # if we're given a langcode, we can generate everything else
             if not is_reconstr:
                 is_reconstr = langcodes.is_reconstr(langcode)
             if not langname:
-                langname = langcodes.name(langcode)
-            self.langcode = langcode
-            self.langname = langname
-            self.reconstr = is_reconstr
+                langname = langcodes.name(langcode, use_ety=True)
+            code = langcode
+            name = langname
+            reconstr = is_reconstr
         elif langqstr:  # if we're not given a langcode, but we're given a langqstr
-            self.langcode = None
+            code = None
             if langqstr.startswith("R:"):
-                self.langname = langqstr[2:]
-                self.reconstr = True
+                name = langqstr[2:]
+                reconstr = True
             elif langqstr.startswith("Reconstruction:"):
-                self.langname = langqstr[15:]
-                self.reconstr = True
+                name = langqstr[15:]
+                reconstr = True
             elif langqstr.startswith(
                 "Proto-"
             ):  # Workaround while I get wikikey working on the prod version
-                self.langname = langqstr
-                self.reconstr = True
+                name = langqstr
+                reconstr = True
             else:
                 if not langname:
                     langname = langqstr
-                    analyze_lname = True
+                analyze_lname = True
+            if langqstr.startswith(("R:", "Reconstruction:", "Proto-")):
+                code = langcodes.code(name, use_ety=True)
         else:
             analyze_lname = True
         if analyze_lname:
             # if we're not given a langcode nor langqstr, but we may/may not have been given a langname
             # this is tricky
-            self.langcode = None
-            self.langname = langname
+            name = langname
+            code = langcodes.code(langname, use_ety=True)
 
             if is_reconstr is None:
-                if self.langname.startswith("Proto"):
-                    self.reconstr = True
-                else:
-                    self.reconstr = False
-                    # !!! If we're given only the langname, it is usual that it is not reconstructed
-                    # TODO: Some languages, such as Old English, have reconstructed terms yet are not proto-languages!
-                    # TODO: HUGE ASSUMPTION! - that all non-proto languages are not reconstructed, and that the user properly formatted those langs right!
+                reconstr = langcodes.is_reconstr_name(name)
             else:
-                self.reconstr = is_reconstr
-                # langcodes.is_name_reconstr(self.langname)
+                reconstr = is_reconstr
             if not langname:
                 if warn:
                     warnings.warn("Neither langcode nor langname received.")
-        self.langqstr = (
-            ("R:" + self.langname)
-            if self.reconstr and self.langname
-            else (self.langname)
-        )
+        return code, name, reconstr
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Languages are immutable, can't set {name}")
+
+    def __reduce__(self):
+        return _intern, (self.langcode, self.langname, self.reconstr)
 
     def __bool__(self):
         return bool(self.langcode or self.langname)
 
     def __eq__(self, other):
-        if (
-            isinstance(other, Language)
-            and bool(self) == bool(other)
-            and self.reconstr == other.reconstr
-        ):
-            if self.langcode and other.langcode:
-                if self.langname and other.langname:
-                    return (
-                        self.langcode == other.langcode
-                        and self.langname == other.langname
-                    )
-                else:
-                    return self.langcode == other.langcode
-            else:
-                if self.langname and other.langname:
-                    return self.langname == other.langname
-                else:
-                    # Nothing matches. Perhaps it's self.langcode vs other.langname
-                    return False
-        else:
-            return False
-
+        # interned, so equal Languages are almost always the same object
+        if self is other:
+            return True
+        if isinstance(other, Language):
+            return (self.langcode, self.langname, self.reconstr) == (
+                other.langcode,
+                other.langname,
+                other.reconstr,
+            )
         return False
 
+    def __hash__(self):
+        return hash((self.langcode, self.langname, self.reconstr))
+
     def __str__(self):
         return self.langqstr if self else ""
 
@@ -1,5 +1,6 @@
-from typing import List, Union
+from typing import List, Union, Optional, Tuple
 
+from mwparserfromhell.nodes import Heading
 from mwparserfromhell.wikicode import Wikicode
 
 import wikt_api as wikt
@@ -21,30 +22,21 @@ class Header:
 
     def __init__(
         self,
-        wikicode: Wikicode,
-        subordinates: List[Wikicode],
+        wikicode: Union[Wikicode, str],
+        subordinates: List[Union[Wikicode, str]],
         header_type: str = None,
         idx: int = None,
         metainfo=None,
         lvl: int = 3,
     ):
-        assert wikicode.startswith("=" * lvl) and not wikicode.startswith(
-            "=" * (lvl + 1)
+        classified = poscodes.classify(wikicode)
+        assert (
+            classified is not None and classified[0] == lvl
         )  # assert that the level is correct
         if header_type is None:  # auto header type deduce
-            breve: str = wikicode[
-                lvl:
-            ]  # len("===") == 3 # "===Pronunciation===" --> "Pronunciation==="
-            header_type = breve[
-                : breve.index("=" * lvl)
-            ]  # "Pronunciation===" -> "Pronunciation"
-
-            if idx is None and header_type.startswith("Etymology "):  # auto idx deduce
-                assert len(header_type) >= 11  # len("Etymology 1")
-                idx = int(header_type[10:])
-                assert idx and type(idx) == int
-                header_type = "Etymology"
-            defn_flag = header_type in poscodes.all
+            _, header_type, ety_idx, defn_flag = classified
+            if idx is None:  # auto idx deduce
+                idx = ety_idx
             if defn_flag and metainfo is None:
                 metainfo = "Definition"
 
@@ -80,7 +72,68 @@ class Entry:
         self.desc = desc
 
 
-def lex(dom: List[Wikicode]) -> List[Entry]:
+class HeaderNode:
+    """
+    A header in the tree made by index_headers(): dom[start] is the header's own section,
+    and dom[start + 1:end] are its subsections.
+    """
+
+    __slots__ = ("level", "title", "start", "end", "children")
+
+    def __init__(self, level: int, title: str, start: int):
+        self.level = level
+        self.title = title
+        self.start = start
+        self.end = start + 1
+        self.children = []  # type: List[HeaderNode]
+
+    def subheaders(self, level: int) -> List["HeaderNode"]:
+        return [child for child in self.children if child.level == level]
+
+    def header(self, dom: List[Union[Wikicode, str]]) -> "Header":
+        return Header(dom[self.start], dom[self.start + 1 : self.end], lvl=self.level)
+
+    def __repr__(self):
+        return f"HeaderNode({self.level}, {self.title!r}, {self.start}:{self.end})"
+
+
+def get_heading(sec: Union[Wikicode, str]) -> Optional[Tuple[int, str]]:
+    """
+    (level, title) of the heading that a section starts with, or None for the lead.
+    A raw section (see mwparserhelper.split_one_lang()) is read without parsing it.
+    """
+    if isinstance(sec, str):
+        return mwparserhelper.raw_heading(sec)
+    heading = sec.nodes[0] if sec.nodes else None
+    if not isinstance(heading, Heading):
+        return None
+    return heading.level, str(heading.title)
+
+
+def index_headers(dom: List[Union[Wikicode, str]]) -> List[HeaderNode]:
+    """
+    One pass over the sections, returning the tree of their headers (the top level ones, with the rest nested).
+    Works on both flat and redundant doms, since either way the sections are in the order of their headers,
+    and on raw doms, whose sections are wikitext.
+    """
+    roots = []  # type: List[HeaderNode]
+    stack = []  # type: List[HeaderNode]
+    for i, sec in enumerate(dom):
+        heading = get_heading(sec)
+        if heading is None:
+            continue  # the lead
+        level, title = heading
+        while stack and stack[-1].level >= level:
+            stack.pop().end = i
+        node = HeaderNode(level, title, i)
+        (stack[-1].children if stack else roots).append(node)
+        stack.append(node)
+    for node in stack:
+        node.end = len(dom)
+    return roots
+
+
+def lex(dom: List[Union[Wikicode, str]]) -> List[Entry]:
     is_multi_ety = None
 
     ety = None  # type: Header
@@ -89,22 +142,25 @@ def lex(dom: List[Wikicode]) -> List[Entry]:
     preety = []
     desc = []  # type: List[Header]
     did_lemma = False
-    for lvl3plus in mwparserhelper.sections_by_level(dom, 3):
-
-        lvl3 = lvl3plus[0]
-        if lvl3.startswith("===Etymology"):
+    roots = index_headers(dom)
+    lvl3s = [
+        node
+        for root in roots
+        for node in ([root] if root.level == 3 else root.subheaders(3))
+    ]
+    for lvl3node in lvl3s:
+
+        lvl3 = dom[lvl3node.start]
+        if lvl3node.title.startswith("Etymology"):
             assert did_lemma is False  # Etymology should ALWAYS come before lemmas
 
-            if lvl3.startswith("===Etymology==="):
+            if lvl3node.title == "Etymology":
                 assert is_multi_ety is None  # There Should be Exactly one ety
                 is_multi_ety = False
                 assert not ety  # There should be exactly one ety
-                ety = Header(lvl3, lvl3plus[1:])
-                lvl4s = mwparserhelper.sections_by_level(lvl3plus[1:], 4)
-                for lvl4plus in lvl4s:
-                    lvl4 = lvl4plus[0]
-                    h = Header(lvl4, lvl4plus[1:], lvl=4)
-                    nonetys.append(h)
+                ety = lvl3node.header(dom)
+                for lvl4node in lvl3node.subheaders(4):
+                    nonetys.append(lvl4node.header(dom))
             else:  # multiple etys
                 assert is_multi_ety is not False
                 assert is_multi_ety in [None, True]
@@ -115,22 +171,19 @@ def lex(dom: List[Wikicode]) -> List[Entry]:
                     entry = Entry(ety, nonetys, desc)
                     entries.append(entry)
 
-                ety = Header(lvl3, lvl3plus[1:])
+                ety = lvl3node.header(dom)
                 nonetys = []
                 desc = []
-        elif lvl3.startswith("===Root"):
+        elif lvl3node.title.startswith("Root"):
             # Reconstructed langs
             # TODO: Do the Descendants tab in for nonReconstructed langs
-            lvl4s = mwparserhelper.sections_by_level(lvl3plus[1:], 4)
-            for lvl4plus in lvl4s:
-                lvl4 = lvl4plus[0]
-                h = Header(lvl4, lvl4plus[1:], lvl=4)
-                desc.append(h)
+            for lvl4node in lvl3node.subheaders(4):
+                desc.append(lvl4node.header(dom))
             pass
         else:
             # Something other than an Etymology: is it a POS?
 
-            h = Header(lvl3, lvl3plus[1:])
+            h = lvl3node.header(dom)
             if poscodes.is_defn(lvl3):
                 assert (
                     not is_multi_ety
@@ -6,6 +6,7 @@ import networkx as nx  # rumored to be slow, but I'm just using it temporarily
 
 
 from etyobjects import Originator
+from langcode import genealogy
 
 # https://iconscout.com/blog/15-classic-color-scheme-generators-to-pick-the-perfect-palette
 
@@ -87,20 +88,16 @@ def mainloop(
             ety.draw_graph(G, pause=True)
         _ = [print(x) for x in G.nodes]
 
-        if GG_origin:
-
-            # good, we found a connection
-            # fuse the graphs, which should now be connected because we fused and forced our tree G to use a preexisting origin.
-            GG = nx.compose(GG, G)
-            if draw_graphs:
-                ety.draw_graph(GG)
-        else:
-            if (
-                total_queries != 1
-            ):  # warn unconnected queries, unless it's the initial query in which it's OK
-                warnings.warn("Unconnected query " + str(_Q.origin))
+        if GG is None:
             GG = G
             continue
+        if not GG_origin:
+            warnings.warn("Unconnected query " + str(_Q.origin))
+        # Nodes are identified by value (see WordRelation.key), so the words G shares with GG are fused,
+        # whether or not the query itself was connected through GG_origin
+        GG = nx.compose(GG, G)
+        if draw_graphs:
+            ety.draw_graph(GG)
 
         """
         common_link = ety.contains_originator(GG, origin)
@@ -112,6 +109,14 @@ def mainloop(
         """
 
 
+def cog_lang_filter(*langnames: str) -> List[str]:
+    """
+    The langs and all of their known ancestors, for mainloop(cog_search_langs=...)
+    See langcode.genealogy.lineage(), which is cached
+    """
+    return list(genealogy.lineage(*langnames))
+
+
 def graph_to_str(G: nx.DiGraph):
     dl = nx.to_dict_of_lists(G)
     return repr(dl)
@@ -137,8 +142,9 @@ def graph_to_cyto(G: nx.DiGraph) -> dict:
 
 if __name__ == "__main__":
     print("main")
+    # gencodes has no ancestry, so the inherited lines of English and French are still spelled out
     mainloop(
-        cog_search_langs=[
+        cog_search_langs=cog_lang_filter(
             "English",
             "Middle English",
             "Old English",
@@ -149,6 +155,6 @@ if __name__ == "__main__":
             "Latin",
             "Old Latin",
             "Proto-Italic",
-        ]
+        )
     )
     # All ancestors of both ENglish and French langs, according to https://en.wiktionary.org/wiki/Category:English_language and https://en.wiktionary.org/wiki/Category:French_language
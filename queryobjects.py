@@ -63,12 +63,28 @@ class ThickQuery:
         self.res = res
         self.wikitext = wikitext
         self.dom = dom
+        self._entries = None  # type: Optional[List["Entry"]]
 
         self.origin = origin
 
     def biglang(self):
         return self.Lang
 
+    @property
+    def entries(self) -> List["Entry"]:
+        """
+        The lexed dom. Lexed on first use, unless it was loaded ready-made (see entrycodec)
+        """
+        if self._entries is None:
+            import lexer  # lexer imports wikt_api, which imports us
+
+            self._entries = lexer.lex(self.dom)
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: List["Entry"]):
+        self._entries = entries
+
     def to_tupled(self):
         return (
             (self.me, self.word, self.langname, self.def_id),
@@ -110,7 +126,8 @@ class ThickQuery:
             res = result.wikiresponse
             wikitext = result.wikitext
             dom = result.dom
-        self.__init__(
+        ThickQuery.__init__(  # not self.__init__, which would be DummyQuery's for DummyQueries
+            self,
             me=me,
             word=wkey.word,
             langname=wkey.Lang.langname,
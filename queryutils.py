@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Union, Tuple
 
 from emulate.moduleimpl import QueryFlags
@@ -30,11 +31,14 @@ def node_to_qparts(
     return None, None, None
 
 
+@lru_cache(maxsize=4096)
 def query_to_qparts(
     query: str, warn=True, crash=False
 ) -> Tuple[str, Language, QueryFlags]:
     """
     The returned qflags and qflags.def_id WILL be initialized and is guaranteed nonnull.
+    Memoized: the same query gets the same (shared) word, Language and QueryFlags, so don't modify them.
+    See query_to_qparts.cache_info() for how well that's going.
     """
     assert query
     do_deriv = ""
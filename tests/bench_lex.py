@@ -0,0 +1,55 @@
+"""
+Times lexer.lex() on the test assets, and the header walk it's built on:
+lexer.index_headers() against the sections_by_level() generators it replaced.
+Run from the tests folder: python bench_lex.py
+"""
+import glob
+import timeit
+
+import wikt_api  # import first, to settle the circular imports
+import lexer
+from eobjects import mwparserhelper
+
+
+def walk_by_level(dom):
+    # the old walk: level 3 sections, then each one's level 4 sections
+    for lvl3plus in mwparserhelper.sections_by_level(dom, 3):
+        for _ in mwparserhelper.sections_by_level(lvl3plus[1:], 4):
+            pass
+
+
+def walk_by_index(dom):
+    for root in lexer.index_headers(dom):
+        for lvl3 in root.subheaders(3):
+            lvl3.subheaders(4)
+
+
+def main(number=200):
+    mwparserhelper.dom_cache = None
+    doms = []
+    for path in sorted(glob.glob("assets/wtxt_*.txt")):
+        with open(path, encoding="utf-8") as f:
+            wikitext = f.read()
+        for lang in mwparserhelper.scan_langs(wikitext):
+            for redundance in (False, True):
+                _, dom, _ = mwparserhelper.parse_one_lang(
+                    wikitext, lang, redundance=redundance
+                )
+                doms.append(dom)
+
+    def bench(fn):
+        def run():
+            for dom in doms:
+                fn(dom)
+
+        return timeit.timeit(run, number=number) / number * 1000
+
+    old, new = bench(walk_by_level), bench(walk_by_index)
+    print(f"{len(doms)} doms, {number} runs")
+    print(f"sections_by_level walk: {old:.3f}ms")
+    print(f"index_headers walk:     {new:.3f}ms ({old / new:.1f}x)")
+    print(f"lex:                    {bench(lexer.lex):.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
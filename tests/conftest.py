@@ -0,0 +1,15 @@
+import pytest
+
+import wikt_api  # noqa: F401 # eobjects.apiresult can't be imported first
+from eobjects import apiresult
+from eobjects.diskcache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def api_cache(monkeypatch, tmp_path_factory):
+    """
+    Every test gets an empty api cache of its own, rather than the user's (~/.cache/pyetymology/api)
+    """
+    cache = DiskCache(str(tmp_path_factory.mktemp("api")))
+    monkeypatch.setattr(apiresult, "cache", cache)
+    return cache
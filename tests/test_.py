@@ -1,13 +1,15 @@
 from typing import List, Tuple
 
 import dill
+import mwparserfromhell as mwp
 import networkx as nx
 from mwparserfromhell.wikicode import Wikicode
 
 import eobjects.apiresult
 import eobjects.mwparserhelper
 import wikt_api as wx, queryobjects
-from etyobjects import Originator
+from etyobjects import Originator, EtyRelation
+from langcode import poscodes
 from queryobjects import ThickQuery
 
 
@@ -45,10 +47,9 @@ def fetch_query(topic: str, lang: str, query_id: int = 0) -> ThickQuery:
             dom, me, word, lang = auto_lang(dom, me, word, lang, mimic_input=mimic_input)
             The following mimics the function auto_lang()
             """
-            res, dom = eobjects.mwparserhelper.wikitextparse(wikitext, redundance=True)
-            dom = list(
-                eobjects.mwparserhelper.sections_by_lang(dom, lang)
-            )  # expanded auto_lang()
+            res, dom, _ = eobjects.mwparserhelper.parse_one_lang(
+                wikitext, lang, redundance=True
+            )  # expanded auto_lang(), parsed only once per session
 
             wikiresponse = None, res, dom
             bigQ = queryobjects.from_tupled(query, wikiresponse, origin)
@@ -76,9 +77,8 @@ def fetch_query(topic: str, lang: str, query_id: int = 0) -> ThickQuery:
 
         dom, me, word, lang = auto_lang(dom, me, word, lang, mimic_input=mimic_input)
         """
-        res, dom = eobjects.mwparserhelper.wikitextparse(wikitext, redundance=True)
-        dom = list(
-            eobjects.mwparserhelper.sections_by_lang(dom, lang)
+        res, dom, _ = eobjects.mwparserhelper.parse_one_lang(
+            wikitext, lang, redundance=True
         )  # expanded auto_lang()
         wikiresponse = None, res, dom
         bigQ = queryobjects.from_tupled(query, wikiresponse, origin)
@@ -137,6 +137,35 @@ class Test:
         assert eobjects.mwparserhelper.has_exact_prefix("==Spanish==", "==")
         assert not eobjects.mwparserhelper.has_exact_prefix("===Etymology===", "==")
 
+    def test_classify_header(self):
+        assert poscodes.classify("===Etymology 2===\nFrom...") == (
+            3,
+            "Etymology",
+            2,
+            False,
+        )
+        assert poscodes.classify("=====Proper noun=====") == (
+            5,
+            "Proper noun",
+            None,
+            True,
+        )
+        assert poscodes.classify("====Verbal noun====") == (
+            4,
+            "Verbal noun",
+            None,
+            False,
+        )
+        assert poscodes.classify("==Spanish==") is None
+        dom = fetch_resdom("llevar")[1]
+        assert [poscodes.is_defn(sec) for sec in dom[:5]] == [
+            False,
+            False,
+            False,
+            False,
+            True,
+        ]
+
     def test_null_sections_by_level(self):
         dom = fetch_resdom("llevar")[1]
         assert list(eobjects.mwparserhelper.sections_by_level(dom, 6)) == []
@@ -161,3 +190,12 @@ def graph_to_str(G):
 
 
 # TODO: Test Unsupported Titles
+
+
+def test_relation_is_compact():
+    template = mwp.parse("{{inh|es|la|plicō|t=to fold}}").filter_templates()[0]
+    rel = EtyRelation(Originator("plegar", o_id=0), template)
+    assert not hasattr(rel, "__dict__")
+    assert rel.params == ("es", "la", "plicō", "t=to fold")
+    assert all(type(param) is str for param in rel.params)
+    assert str(rel) == "{inh|Latin|plicō ['t=to fold']}"
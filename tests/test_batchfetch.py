@@ -0,0 +1,108 @@
+import json
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+import wikt_api as wx
+from eobjects import apiresult, batchfetch
+from eobjects.diskcache import DiskCache
+from etyobjects import MissingException
+from queryobjects import ThickQuery
+from tests.test_ import fetch_wikitext
+
+
+class FakeSession:
+    """
+    Answers multi-title queries from the test assets, and remembers every url asked for.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    def get(self, fullurl, params=None):
+        self.urls.append(fullurl)
+        titles = parse_qs(urlsplit(fullurl).query)["titles"][0].split("|")
+        pages = []
+        for title in titles:
+            if title in self.pages:
+                pages.append(
+                    {
+                        "pageid": 1,
+                        "ns": 0,
+                        "title": title,
+                        "revisions": [
+                            {"slots": {"main": {"content": self.pages[title]}}}
+                        ],
+                    }
+                )
+            else:
+                pages.append({"ns": 0, "title": title, "missing": True})
+        jsn = {"batchcomplete": True, "query": {"pages": pages}}
+        return apiresult.local_response(fullurl, json.dumps(jsn))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession(
+        {"llevar": fetch_wikitext("llevar"), "llegar": fetch_wikitext("llegar")}
+    )
+    monkeypatch.setattr(apiresult, "session", session)
+    monkeypatch.setattr(apiresult, "cache", None)
+    return session
+
+
+def test_split_batch():
+    jsn = {
+        "query": {
+            "normalized": [{"from": "llevar_", "to": "llevar"}],
+            "pages": [
+                {
+                    "title": "llevar",
+                    "revisions": [{"slots": {"main": {"content": "==Spanish=="}}}],
+                },
+                {"title": "nope", "missing": True},
+                {"title": "truncated"},
+            ],
+        }
+    }
+    pages = batchfetch.split_batch(jsn)
+    assert pages["llevar"]["parse"]["wikitext"] == "==Spanish=="
+    assert pages["llevar_"] is pages["llevar"]
+    assert pages["nope"]["error"]["code"] == "missingtitle"
+    assert "truncated" not in pages
+
+
+def test_query_many_batched(session):
+    Qs = wx.query_many(["llevar#Spanish", "nope#Spanish", "llegar#Catalan"])
+    assert len(session.urls) == 1  # all three pages in one api call
+    assert type(Qs[0]) is ThickQuery and Qs[0].word == "llevar"
+    assert isinstance(Qs[1], MissingException)
+    assert type(Qs[2]) is ThickQuery and Qs[2].langname == "Catalan"
+
+
+def test_batch_size(session):
+    wkeys = [wx.WikiKey.from_query(me) for me in ("llevar#Spanish", "llegar#Spanish")]
+    assert batchfetch.load_results(wkeys, batch_size=1) == [None, None]
+    assert len(session.urls) == 2
+    assert [w.result.jsn["parse"]["title"] for w in wkeys] == ["llevar", "llegar"]
+
+
+def test_only_pages_are_cached(session, monkeypatch, tmp_path):
+    cache = DiskCache(str(tmp_path))
+    monkeypatch.setattr(apiresult, "cache", cache)
+    wkeys = [wx.WikiKey.from_query(me) for me in ("llevar#Spanish", "llegar#Spanish")]
+    assert batchfetch.load_results(wkeys) == [None, None]
+    assert cache.get(batchfetch.batch_url(["llegar", "llevar"])) is None
+    assert all(cache.get(wkey.fullurl) for wkey in wkeys)
+    assert len(list(cache._files())) == 2
+
+
+def test_cached_pages_arent_batched(session, monkeypatch, tmp_path):
+    monkeypatch.setattr(apiresult, "cache", DiskCache(str(tmp_path)))
+    queries = ["llevar#Spanish", "llegar#Spanish"]
+    first = wx.query_many(queries)
+    second = wx.query_many(queries)
+    assert len(session.urls) == 1
+    assert all(type(Q) is ThickQuery for Q in first + second)
+    assert apiresult.cache.hits == 2
@@ -0,0 +1,134 @@
+import subprocess
+import sys
+
+from langcode import codetable, langcodes
+
+
+def test_table_is_up_to_date(tmp_path):
+    path = str(tmp_path / "codetable.tsv")
+    codetable.generate(path)
+    with open(path, encoding="utf-8") as f, open(
+        codetable.TABLE_PATH, encoding="utf-8"
+    ) as committed:
+        assert f.read() == committed.read(), "run python -m langcode.codetable"
+
+
+def test_lookup():
+    assert langcodes.name("es") == "Spanish"
+    assert langcodes.name("sxu") is None
+    assert langcodes.name("sxu", use_ety=True) == "Upper Saxon"
+    assert langcodes.name("roa", use_ety=True, use_fam=True) == "Romance"
+    assert langcodes.name("roa-nope", use_ety=True, use_fam=True) is None
+    row = codetable.get(codetable.ETY, "sxu")
+    assert row.parent == "gmw-ecg"  # from a "\tparent" key
+    assert codetable.get(codetable.FAM, "roa").proto == "la"
+    assert [code for code, _ in codetable.items(codetable.ETY)][:2] == ["AE.", "AG."]
+
+
+def test_import_skips_python_tables():
+    code = (
+        "import sys; from langcode import langcodes; langcodes.name('en', True, True); "
+        "print(any(m in sys.modules for m in "
+        "('langcode.gencodes', 'langcode.etycodes', 'langcode.famcodes')))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == "False"
+
+
+def test_reverse_lookup():
+    assert langcodes.code("Spanish") == "es"
+    assert langcodes.code("spanish") == "es"
+    assert langcodes.code("Gheg") is None
+    assert langcodes.code("gheg", use_ety=True) == "aln"  # an alias
+    # a lang beats a family of the same name
+    assert langcodes.code("Arabic", use_ety=True, use_fam=True) == "ar"
+    assert langcodes.code("Romance", use_fam=True) == "roa"
+    assert langcodes.codes_by_prefix("proto-indo-e") == [
+        ("Proto-Indo-European", "ine-pro")
+    ]
+    assert ("Old English", "ang") in langcodes.codes_by_prefix("old eng")
+
+
+def test_language_gets_langcode():
+    from langhelper import Language
+
+    assert Language(langname="Spanish").langcode == "es"
+    assert Language(langqstr="R:Proto-Indo-European").langcode == "ine-pro"
+    assert Language(langname="Vulgar Latin").langcode == "la-vul"
+    assert Language(langname="Spanish") == Language(langcode="es")
+    assert Language(langname="Not a Language").langcode is None
+
+
+def test_reverse_lookup_prefers_template_codes():
+    # etycodes has old abbreviations under the same names as the codes templates use
+    for name, code in [
+        ("Vulgar Latin", "la-vul"),
+        ("Late Latin", "la-lat"),
+        ("Ecclesiastical Latin", "la-ecc"),
+        ("American English", "en-US"),
+        ("Koine Greek", "grc-koi"),
+        ("Kölsch", "ksh"),
+    ]:
+        assert langcodes.code(name, use_ety=True) == code
+    from langhelper import Language
+
+    assert Language(langname="Late Latin") is Language(langcode="la-lat")
+
+
+def test_is_reconstr():
+    from langhelper import Language
+    from emulate import template2url
+
+    assert langcodes.is_reconstr("ine-pro")
+    assert langcodes.is_reconstr("gem-pro")
+    assert not langcodes.is_reconstr(
+        "ang"
+    )  # has reconstructed terms, but isn't reconstructed
+    assert not langcodes.is_reconstr("es")
+    assert not langcodes.is_reconstr("VL.")
+    assert langcodes.is_reconstr_name("proto-germanic")
+    assert not langcodes.is_reconstr_name("Old English")
+    assert Language(langname="Proto-Germanic").reconstr
+    assert Language(langname="Proto-Germanic") == Language(langqstr="Proto-Germanic")
+    assert not Language(langqstr="Old English").reconstr
+    assert template2url.mimicked_keyword("*wurdą", "Proto-Germanic") == "wurdą"
+    assert template2url.mimicked_keyword("*word", "Old English") == "*word"
+
+
+def test_language_is_interned():
+    import copy
+    import pickle
+
+    import pytest
+    from langhelper import Language
+
+    Lang = Language(langname="Spanish")
+    assert Language(langcode="es") is Lang
+    assert Language(langqstr="Spanish") is Lang
+    assert copy.deepcopy(Lang) is Lang
+    assert pickle.loads(pickle.dumps(Lang)) is Lang
+    assert {Lang: 1}[Language(langcode="es")] == 1
+    assert Language(langqstr="R:Proto-Germanic").langqstr == "R:Proto-Germanic"
+    assert Language(langcode="gem-pro") is Language(langqstr="R:Proto-Germanic")
+    assert Language(langname="Latin") != Lang
+    with pytest.raises(AttributeError):
+        Lang.langname = "Latin"
+
+
+def test_language_interning_is_bounded():
+    import gc
+
+    import langhelper
+    from langhelper import Language
+
+    Lang = Language(langname="Spanish")
+    for i in range(
+        5000
+    ):  # ie. a long running process, queried with all sorts of spellings
+        Language(langqstr=f"Spanish{i}", warn=False)
+    gc.collect()
+    assert langhelper._from_args.cache_info().currsize <= 4096
+    assert len(langhelper._interned) <= 4096 + 100
+    assert Language(langcode="es") is Lang  # still interned while in use
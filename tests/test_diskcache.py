@@ -0,0 +1,74 @@
+import os
+import time
+
+from eobjects import diskcache
+from eobjects.diskcache import DiskCache, normalize_url
+
+
+def test_normalize_url():
+    a = "http://en.wiktionary.org/w/api.php?action=parse&page=comprar&prop=wikitext&formatversion=2&format=json#Spanish"
+    b = "https://en.wiktionary.org/w/api.php?page=comprar&action=parse&prop=wikitext&format=json&formatversion=2"
+    assert normalize_url(a) == normalize_url(b)
+    c = "https://en.wiktionary.org/w/api.php?action=parse&page=Reconstruction:Proto-West_Germanic/mak%C5%8Dn"
+    d = "https://en.wiktionary.org/w/api.php?action=parse&page=Reconstruction%3AProto-West_Germanic%2Fmakōn"
+    assert normalize_url(c) == normalize_url(d)
+    assert normalize_url(a) != normalize_url(c)
+
+
+class TestDiskCache:
+    url = "https://en.wiktionary.org/w/api.php?action=parse&page=llevar&prop=wikitext&formatversion=2&format=json"
+
+    def test_hit_miss(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        assert cache.get(self.url) is None
+        cache.put(self.url, '{"parse": {}}')
+        assert cache.get(self.url + "#Spanish") == '{"parse": {}}'
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_ttl(self, tmp_path):
+        cache = DiskCache(str(tmp_path), ttl=60)
+        cache.put(self.url, "{}")
+        path = cache._path(self.url)
+        os.utime(path, (time.time(), time.time() - 120))  # written 2 minutes ago
+        assert cache.get(self.url) is None
+        assert not os.path.exists(path)
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=25)
+        urls = [self.url.replace("llevar", w) for w in ("a", "b", "c")]
+        cache.put(urls[0], "x" * 10)
+        cache.put(urls[1], "x" * 10)
+        os.utime(cache._path(urls[0]), (time.time() - 100, time.time()))
+        os.utime(cache._path(urls[1]), (time.time() - 50, time.time()))
+        assert cache.get(urls[0])  # a is now the most recently used
+        cache.put(urls[2], "x" * 10)
+        assert cache.get(urls[1]) is None  # so b is evicted
+        assert cache.get(urls[0]) and cache.get(urls[2])
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["bytes"] == 20
+
+    def test_eviction_goes_below_max_bytes(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=100, low_water=0.5)
+        urls = [self.url.replace("llevar", str(i)) for i in range(11)]
+        for i, url in enumerate(urls):
+            cache.put(url, "x" * 10)
+            os.utime(cache._path(url), (time.time() - 100 + i, time.time()))
+        # the 11th put overflows, and the 6 oldest go, leaving room for 5 more puts without another scan
+        assert cache.stats["evictions"] == 6
+        assert cache.stats["bytes"] == 50
+        assert cache.get(urls[5]) is None and cache.get(urls[6])
+
+    def test_reads_outside_the_lock(self, tmp_path, monkeypatch):
+        cache = DiskCache(str(tmp_path))
+        cache.put(self.url, "{}")
+
+        def unlocked_open(*args, **kwargs):
+            assert (
+                not cache._lock.locked()
+            )  # other threads' hits don't wait on this read
+            return open(*args, **kwargs)
+
+        monkeypatch.setattr(diskcache, "open", unlocked_open, raising=False)
+        assert cache.get(self.url) == "{}"
+        assert cache.stats["hits"] == 1
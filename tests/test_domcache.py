@@ -0,0 +1,83 @@
+from eobjects import mwparserhelper
+from eobjects.domcache import DomCache
+from tests.test_ import fetch_wikitext
+
+
+def test_lru_eviction():
+    cache = DomCache(max_chars=10)
+    cache.put("a", "A", 4)
+    cache.put("b", "B", 4)
+    assert cache.get("a") == "A"  # b is now the least recently used
+    cache.put("c", "C", 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.stats["evictions"] == 1
+    assert cache.chars == 8
+
+
+def test_parse_one_lang(monkeypatch):
+    monkeypatch.setattr(mwparserhelper, "dom_cache", DomCache())
+    wikitext = fetch_wikitext("llevar")
+    res, dom, langname = mwparserhelper.parse_one_lang(wikitext, "Spanish")
+    assert langname == "Spanish"
+    assert str(dom[0]) == "==Spanish==\n\n"
+    assert mwparserhelper.parse_one_lang(wikitext, "Spanish")[1] is dom
+    assert mwparserhelper.parse_one_lang(wikitext, "Catalan")[1] is not dom
+    assert mwparserhelper.dom_cache.stats["hits"] == 1
+
+    # an abbreviation is cached under the lang it resolves to as well
+    assert mwparserhelper.parse_one_lang(wikitext, "Cat")[2] == "Catalan"
+    _, dom2, _ = mwparserhelper.parse_one_lang(wikitext, "Catalan")
+    assert mwparserhelper.parse_one_lang(wikitext, "Cat")[1] is dom2
+
+
+def test_lazy_is_cached_apart(monkeypatch):
+    monkeypatch.setattr(mwparserhelper, "dom_cache", DomCache())
+    wikitext = fetch_wikitext("llevar")
+    lazy_res = mwparserhelper.parse_one_lang(wikitext, "Spanish")[0]
+    res = mwparserhelper.parse_one_lang(wikitext, "Spanish", lazy=False)[0]
+    assert str(res) == wikitext  # the whole page, not the cached section
+    assert str(lazy_res) != wikitext
+
+
+def test_lazy_parse_matches_full_parse(monkeypatch):
+    monkeypatch.setattr(mwparserhelper, "dom_cache", None)
+    wikitext = fetch_wikitext("llegar")
+    langs = mwparserhelper.scan_langs(wikitext)
+    assert list(langs) == ["Asturian", "Catalan", "Old Irish", "Spanish"]
+    for lang in langs:
+        for redundance in (False, True):
+            _, lazy_dom, lazy_lang = mwparserhelper.parse_one_lang(
+                wikitext, lang, redundance=redundance
+            )
+            _, dom, langname = mwparserhelper.parse_one_lang(
+                wikitext, lang, redundance=redundance, lazy=False
+            )
+            assert lazy_lang == langname
+            assert [str(sec) for sec in lazy_dom] == [str(sec) for sec in dom]
+
+
+# the scan misses the Spanish heading, which mwparserfromhell still reads as one
+MISSED_HEADING = (
+    "==English==\n\n===Etymology===\nFrom {{inh|en|enm|word}}.\n\n"
+    "==Spanish==<!-- c -->\n\n===Etymology===\nFrom {{inh|es|la|verbum}}.\n"
+)
+
+
+def test_lazy_parse_distrusts_a_missed_heading(monkeypatch):
+    monkeypatch.setattr(mwparserhelper, "dom_cache", DomCache())
+    assert list(mwparserhelper.scan_langs(MISSED_HEADING)) == ["English"]
+    _, dom, langname = mwparserhelper.parse_one_lang(MISSED_HEADING, "Spanish")
+    text = "".join(str(sec) for sec in dom)
+    assert langname == "Spanish" and "verbum" in text and "enm" not in text
+    assert mwparserhelper.parse_one_lang(MISSED_HEADING, "English")[2] == "English"
+    # nor was the wrong dom cached under Spanish
+    assert mwparserhelper.parse_one_lang(MISSED_HEADING, "Spanish")[1] is dom
+
+
+def test_scan_langs_skips_unparsed_markup():
+    wikitext = "==English==\n<!--\n==Old==\n-->\n<nowiki>\n==Fake==\n</nowiki>\n==French==\nx\n"
+    spans = mwparserhelper.scan_langs(wikitext)
+    assert list(spans) == ["English", "French"]
+    start, end = spans["French"]
+    assert wikitext[start:end] == "==French==\nx\n"
@@ -0,0 +1,39 @@
+import bz2
+
+from eobjects import dumpimport
+from eobjects.pagestore import PageStore
+
+dump = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10" xml:lang="en">
+  <siteinfo><sitename>Wiktionary</sitename></siteinfo>
+  <page>
+    <title>llevar</title><ns>0</ns><id>11</id>
+    <revision><id>1</id><text bytes="30" xml:space="preserve">==Spanish==
+===Etymology===
+From {{inh|es|osp|levar}}.</text></revision>
+  </page>
+  <page>
+    <title>Template:inh</title><ns>10</ns><id>12</id>
+    <revision><id>2</id><text xml:space="preserve">{{#invoke:etymology/templates|inherited}}</text></revision>
+  </page>
+  <page>
+    <title>Reconstruction:Proto-Indo-European/pleḱ-</title><ns>118</ns><id>13</id>
+    <revision><id>3</id><text xml:space="preserve">==Proto-Indo-European==</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+def test_import_dump(tmp_path):
+    path = str(tmp_path / "pages-articles.xml.bz2")
+    with bz2.open(path, "wt", encoding="utf-8") as f:
+        f.write(dump)
+    store = PageStore(str(tmp_path / "pages.sqlite"))
+    assert dumpimport.import_dump(path, store, batch_size=1) == 2
+    assert len(store) == 2
+    assert "Template:inh" not in store
+    wikitext, pageid = store.get_page("llevar")
+    assert wikitext.endswith("From {{inh|es|osp|levar}}.") and pageid == 11
+    assert "Reconstruction:Proto-Indo-European/pleḱ-" in store
+    assert "Reconstruction:Proto-Indo-European/pleḱ-" in store.answer(
+        "https://en.wiktionary.org/w/api.php?action=parse&page=Reconstruction:Proto-Indo-European/ple%E1%B8%B1-&prop=wikitext&formatversion=2&format=json"
+    )
@@ -0,0 +1,74 @@
+import json
+
+import mwparserfromhell as mwp
+import pytest
+
+import wikt_api as wx
+from eobjects import entrycodec
+from eobjects.mwparserhelper import parse_one_lang
+from lexer import Header, Entry
+from tests.test_ import fetch_query, graph_to_str
+
+ASSETS = [
+    ("llevar", "Spanish"),
+    ("llevaron", "Spanish"),
+    ("llegar", "Spanish"),
+    ("llegaron", "Spanish"),
+    ("adelante", "Spanish"),
+    ("plico", "Latin"),
+    ("prototype", "English"),
+    ("statt", "German"),
+]
+
+
+def test_nodes_are_stored_once():
+    # a redundant dom's sections contain their subsections, which are stored only once all the same
+    for topic, lang in ASSETS:
+        Q = fetch_query(topic, lang)
+        data = json.loads(entrycodec.dumps(Q.entries))
+        flat = parse_one_lang(str(Q.wikitext), lang, redundance=False)[1]
+        assert len(data["nodes"]) <= sum(len(sec.nodes) for sec in flat)
+
+
+def test_opaque_keeps_its_templates():
+    code = mwp.parse(
+        "===Etymology===\nFrom {{inh|es|la|plicāre}}<ref>{{R:L&S|plico}}, [[plico]]</ref>.\n"
+    )
+    (entry,), _ = entrycodec.loads(entrycodec.dumps([Entry(Header(code, []), [], [])]))
+    assert str(entry.ety.wikicode) == str(code)
+    assert [str(t) for t in entry.ety.wikicode.filter_templates(recursive=True)] == [
+        "{{inh|es|la|plicāre}}",
+        "{{R:L&S|plico}}",
+    ]
+
+
+@pytest.mark.parametrize("topic, lang", ASSETS[:-1])  # statt has nothing to graph
+def test_round_trip(topic, lang):
+    Q = fetch_query(topic, lang)
+    entries, meta = entrycodec.loads(
+        entrycodec.dumps(Q.entries, meta={"query": Q.query})
+    )
+    assert meta == {"query": list(Q.query)}
+    assert len(entries) == len(Q.entries)
+    for entry, orig in zip(entries, Q.entries):
+        for header, orig_header in zip(
+            [entry.ety, *entry.extras, *entry.desc],
+            [orig.ety, *orig.extras, *orig.desc],
+        ):
+            assert (header is None) == (orig_header is None)
+            if header is not None:
+                assert str(header.wikicode) == str(orig_header.wikicode)
+                assert [str(s) for s in header.subordinates] == [
+                    str(s) for s in orig_header.subordinates
+                ]
+
+    Q2 = fetch_query(topic, lang)
+    Q2.entries = entries
+    assert graph_to_str(wx.parse_and_graph(Q2)) == graph_to_str(wx.parse_and_graph(Q))
+
+
+def test_rejects_other_versions():
+    with pytest.raises(ValueError):
+        entrycodec.loads('{"format": "pyetymology-entries", "version": 0}')
+    with pytest.raises(ValueError):
+        entrycodec.loads("[]")
@@ -0,0 +1,26 @@
+from langcode import genealogy
+
+
+def test_ancestors():
+    assert genealogy.ancestors("la-vul") == ("la",)
+    # Old French is the proto-language of the Oïl family, itself a Romance family...
+    assert genealogy.ancestors("roa-oil") == ("fro", "roa", "itc", "la", "ine")
+    assert "la-vul" in genealogy.descendants("la")
+    assert genealogy.ancestors("not-a-code") == ()
+
+
+def test_common_ancestor():
+    assert genealogy.common_ancestor("la-vul", "la-med") == "la"
+    assert genealogy.common_ancestor("roa-oil", "roa-ibe") == "roa"
+    assert genealogy.common_ancestor("la", "la-vul") == "la"
+    assert genealogy.common_ancestor("en", "en") == "en"
+    assert genealogy.common_ancestor("en", "fr") is None  # gencodes has no ancestry
+
+
+def test_lineage():
+    assert genealogy.lineage("Vulgar Latin", "English", "Not a Language") == (
+        "Vulgar Latin",
+        "English",
+        "Not a Language",
+        "Latin",
+    )
@@ -1,4 +1,4 @@
-from emulate import moduleimpl
+from emulate import moduleimpl, entryname
 
 
 def test_macron():
@@ -9,3 +9,28 @@ def test_macron():
         + "plico"
         + "&prop=wikitext&formatversion=2&format=json"
     )
+
+
+def test_entry_names():
+    assert moduleimpl.urlword("ċēap", "Old English") == "ceap"
+    assert moduleimpl.urlword("poëta", "Vulgar Latin") == "poeta"  # Latin's rules
+    assert moduleimpl.urlword("ᾱ̓́γω", "Ancient Greek") == moduleimpl.urlword(
+        "ἄγω", "Ancient Greek"
+    )  # accents stay
+    assert moduleimpl.urlword("вода́", "Russian") == moduleimpl.urlword(
+        "вода", "Russian"
+    )
+    assert moduleimpl.urlword("йод", "Russian") != moduleimpl.urlword("иод", "Russian")
+    assert moduleimpl.urlword("كِتَاب", "Arabic") == moduleimpl.urlword(
+        "كتاب", "Arabic"
+    )
+    assert moduleimpl.urlword("plicō", "Spanish") != "plico"  # no rules, no changes
+    assert moduleimpl.urlword("*wurdą", "Proto-Germanic") == "wurd%C4%85"
+
+
+def test_entry_name_exceptions():
+    # ć decomposes to c and an acute, which Serbo-Croatian's rule removes, but it's a letter of its own
+    assert entryname.make_entry_name("kȕća", "Serbo-Croatian") == "kuća"
+    assert entryname.make_entry_name("Ćȕp", "Serbo-Croatian") == "Ćup"
+    assert entryname.make_entry_name("kuća", "Serbo-Croatian") == "kuća"
+    assert entryname.make_entry_name("rȉjeka", "Serbo-Croatian") == "rijeka"
@@ -10,7 +10,7 @@ from mwparserfromhell.wikicode import Wikicode
 
 import eobjects.apiresult
 import eobjects.mwparserhelper
-import wikt_api as wx, etyobjects, main
+import wikt_api as wx, etyobjects, main, lexer
 from etyobjects import MissingException
 from tests import assets, asset_llevar
 import mwparserfromhell as mwp
@@ -96,6 +96,32 @@ class TestLlevar:
             ],
         ]
 
+    def test_index_headers(self):
+        for redundance in (False, True):
+            res, dom = fetch_resdom("llevar", redundance=redundance)
+            catalan, spanish = lexer.index_headers(dom)
+            assert (catalan.level, catalan.title) == (2, "Catalan")
+            assert [node.title for node in catalan.subheaders(3)] == [
+                "Etymology",
+                "Pronunciation",
+                "Verb",
+                "Further reading",
+            ]
+            # the same sections that sections_by_level() finds
+            assert [
+                dom[node.start : node.end] for node in catalan.subheaders(3)
+            ] == list(
+                eobjects.mwparserhelper.sections_by_level(
+                    dom[catalan.start : catalan.end], 3
+                )
+            )
+            verb = catalan.subheaders(3)[2]
+            assert [node.title for node in verb.subheaders(4)] == [
+                "Conjugation",
+                "Derived terms",
+            ]
+            assert spanish.end == len(dom)
+
     def test_flat_dom(self):
         res, dom = fetch_resdom("llevar", redundance=False)
         secs = list(eobjects.mwparserhelper.sections_by_level(dom, 3))
@@ -131,6 +157,16 @@ class TestLlevar:
             "Catalan",
         )
 
+    def test_index_langs(self):
+        for redundance in (False, True):
+            res, dom = fetch_resdom("llevar", redundance=redundance)
+            spans = eobjects.mwparserhelper.index_langs(dom)
+            assert list(spans) == ["Catalan", "Spanish"]
+            for lang, (start, end) in spans.items():
+                assert dom[start:end] == list(
+                    eobjects.mwparserhelper.sections_by_lang(dom, lang)
+                )
+
     def test_auto_lang_failure(self, monkeypatch):
 
         res, dom = fetch_resdom("llevar", redundance=True)
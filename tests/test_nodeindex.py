@@ -0,0 +1,106 @@
+import mwparserfromhell as mwp
+import networkx as nx
+
+import wikt_api as wx
+from eobjects import nodeindex
+from eobjects.pagestore import PageStore
+from etyobjects import WordRelation, EtyRelation, Originator
+
+from tests.test_ import fetch_query
+
+
+def scan(G, query):
+    # what find_node_by_query() used to do
+    return [
+        node
+        for node in G.nodes
+        if isinstance(node, WordRelation) and node.matches_query(query)
+    ]
+
+
+def working_graph():
+    GG = nx.DiGraph()
+    for i, (topic, lang) in enumerate(
+        [("llevar", "Spanish"), ("adelante", "Spanish"), ("plico", "Latin")]
+    ):
+        GG = nx.compose(GG, wx.graph(fetch_query(topic, lang, query_id=i)))
+    return GG
+
+
+def test_find_nodes_like_scan():
+    GG = working_graph()
+    queries = {"plicō", "plico#Latin", "plicō#Latin", "nothing#Spanish"}
+    for node in GG.nodes:
+        if isinstance(node, WordRelation):
+            queries.add(node.word)
+            if node.langname:
+                queries.add(node.word + "#" + node.langname)
+    assert len(queries) > 10
+    for query in queries:
+        assert nodeindex.find_nodes(GG, query) == scan(GG, query), query
+    node = next(n for n in GG.nodes if isinstance(n, WordRelation) and n.langname)
+    query = node.word + "#" + node.langname
+    assert wx.find_node_by_query(GG, query) is scan(GG, query)[0]
+
+
+def test_index_follows_graph():
+    GG = working_graph()
+    index = nodeindex.node_index(GG)
+    assert nodeindex.node_index(GG) is index
+    assert not nodeindex.find_nodes(GG, "llevado#Spanish")
+
+    template = mwp.parse("{{m|es|llevado}}").filter_templates()[0]
+    rel = EtyRelation(Originator("llevado", o_id=9), template)
+    GG.add_node(rel)  # picked up on the next lookup
+    assert nodeindex.find_nodes(GG, "llevado#Spanish") == [rel]
+    assert nodeindex.node_index(GG) is index
+
+    G2 = nx.compose(GG, nx.DiGraph())  # shares GG.graph, but gets its own index
+    assert nodeindex.node_index(G2) is not index
+    assert nodeindex.find_nodes(G2, "llevado") == [rel]
+
+
+def test_nodes_are_values():
+    def rel(text, o_id):
+        template = mwp.parse(text).filter_templates()[0]
+        return EtyRelation(Originator("x", o_id=o_id), template)
+
+    a, b = rel("{{der|la|ine-pro|*pleḱ-}}", 1), rel(
+        "{{inh|it|ine-pro|*pleḱ-|t=fold}}", 2
+    )
+    assert a == b and hash(a) == hash(b)
+    assert rel("{{m|la|plicō}}", 1) == rel(
+        "{{m|la|plico}}", 1
+    )  # as their entries are titled
+    assert rel("{{m|la|plicō}}", 1) != rel("{{m|es|plicō}}", 1)
+    null = rel("{{unknown|la|plicō}}", 1)
+    assert null == null and null != rel("{{unknown|la|plicō}}", 1)
+
+    G1, G2 = nx.DiGraph(), nx.DiGraph()
+    G1.add_edge(a, rel("{{m|la|plicō}}", 1))
+    G2.add_edge(b, rel("{{m|it|piegare}}", 2))
+    assert len(nx.compose(G1, G2)) == 3
+
+
+def test_chain_doesnt_loop(tmp_path):
+    store = PageStore(str(tmp_path / "pages.sqlite"))
+    store.put_page(
+        "plegar",
+        "==Spanish==\n\n===Etymology===\n"
+        "From {{inh|es|la|plicāre}}, from {{m|la|plicāre}}, from {{inh|la|ine-pro|*pleḱ-}}.\n\n"
+        "===Verb===\n{{es-verb}}\n\n# to [[fold]]\n",
+    )
+    wx.go_offline(store)
+    try:
+        G = wx.graph(wx.query("plegar#Spanish"))
+    finally:
+        wx.go_online()
+        store.close()
+    assert nx.number_of_selfloops(G) == 0
+    # the inh and the m of plicāre are one node
+    assert sorted(repr(node) for node in G.nodes) == [
+        "$0{inh|Latin|plicāre}",
+        "$0{inh|Proto-Indo-European|*pleḱ-}",
+        "plegar#Spanish#1$0",
+    ]
+    assert nx.is_directed_acyclic_graph(G) and G.number_of_edges() == 2
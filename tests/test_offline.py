@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+import wikt_api as wx
+from eobjects.pagestore import PageStore
+from etyobjects import MissingException, WordRelation
+from queryobjects import DummyQuery, ThickQuery
+from tests.test_ import fetch_wikitext
+from tests.test_llevar import G_llevar
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PageStore(str(tmp_path / "pages.sqlite"))
+    store.put_page("llevar", fetch_wikitext("llevar"))
+    store.put_page("llegar", fetch_wikitext("llegar"))
+    store.put_category(
+        "Category:English_terms_derived_from_the_Proto-Indo-European_root_*pleḱ-",
+        ["ply", "plait", "complex"],
+    )
+    wx.go_offline(store)
+    yield store
+    wx.go_online()
+    store.close()
+
+
+class TestOffline:
+    def test_graph(self, store):
+        _Q = wx.query("llevar#Spanish")
+        G = wx.graph(_Q)
+        assert str(_Q.origin) == "llevar#Spanish#1"
+        assert [repr(s) for s in G.nodes if isinstance(s, WordRelation)] == [
+            s for s in reversed(list(G_llevar.nodes)) if not s.startswith("llevar")
+        ]
+
+    def test_missing_page(self, store):
+        with pytest.raises(MissingException) as e_info:
+            wx.query("levar#Old Spanish")
+        assert e_info.value.missing_thing == "page"
+
+    def test_category(self, store):
+        _Q = wx.query("#*pleḱ-#Proto-Indo-European")
+        assert type(_Q) is DummyQuery
+        assert _Q.child_queries == ["complex", "plait", "ply"]
+
+    def test_query_many(self, store):
+        Qs = wx.query_many(["llevar#Spanish", "levar#Old Spanish", "llegar#Catalan"])
+        assert len(Qs) == 3
+        assert type(Qs[0]) is ThickQuery and Qs[0].word == "llevar"
+        assert isinstance(Qs[1], MissingException)
+        assert type(Qs[2]) is ThickQuery and Qs[2].langname == "Catalan"
+        assert [Q.origin.o_id for Q in (Qs[0], Qs[2])] == [0, 2]
+
+    def test_aquery(self, store):
+        async def run():
+            return await asyncio.gather(
+                wx.aquery("llevar#Spanish", query_id=0),
+                wx.aquery("llegar#Spanish", query_id=1),
+            )
+
+        Q1, Q2 = asyncio.run(run())
+        assert (Q1.word, Q2.word) == ("llevar", "llegar")
+        assert Q2.origin.o_id == 1
+        assert [repr(s) for s in wx.graph(Q1).nodes if isinstance(s, WordRelation)] == [
+            s for s in reversed(list(G_llevar.nodes)) if not s.startswith("llevar")
+        ]
@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+from eobjects import apiresult
+from eobjects.diskcache import DiskCache
+from eobjects.ratelimit import RateLimiter, is_throttled, parse_retry_after
+
+
+def test_token_bucket():
+    limiter = RateLimiter(rate=10, burst=2)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)  # the bucket is empty
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+    assert limiter.metrics["requests"] == 4
+    assert limiter.metrics["max_wait"] == pytest.approx(0.2, abs=0.01)
+
+
+def test_backoff():
+    limiter = RateLimiter(rate=1000, burst=10, base_delay=1)
+    assert limiter.backoff(0, {"Retry-After": "3"}) == 3
+    # everyone waits out the Retry-After
+    assert limiter.reserve() == pytest.approx(3, abs=0.05)
+    assert 2 <= limiter.backoff(2, {}) <= 4  # exponential, with jitter
+    assert limiter.metrics["retries"] == 2
+
+
+def test_is_throttled():
+    assert is_throttled(429, "")
+    assert is_throttled(200, json.dumps({"error": {"code": "maxlag", "info": ""}}))
+    assert not is_throttled(200, json.dumps({"error": {"code": "missingtitle"}}))
+    assert not is_throttled(200, json.dumps({"parse": {}}))
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after(None) is None
+
+
+class ThrottlingSession:
+    """
+    Says maxlag to the first request, then answers.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, fullurl, params=None):
+        self.calls.append(params)
+        if len(self.calls) == 1:
+            res = apiresult.local_response(
+                fullurl, json.dumps({"error": {"code": "maxlag", "info": "lagged"}})
+            )
+            res.headers["Retry-After"] = "0"
+            return res
+        return apiresult.local_response(fullurl, json.dumps({"parse": {}}))
+
+
+def test_make_http_request_retries(monkeypatch):
+    session = ThrottlingSession()
+    monkeypatch.setattr(apiresult, "session", session)
+    monkeypatch.setattr(apiresult, "cache", None)
+    monkeypatch.setattr(apiresult, "limiter", RateLimiter())
+    _, jsn = apiresult.make_http_request(
+        "https://en.wiktionary.org/w/api.php?action=parse&page=x"
+    )
+    assert jsn == {"parse": {}}
+    assert session.calls == [{"maxlag": 5}, {"maxlag": 5}]
+    assert apiresult.limiter.metrics["retries"] == 1
+
+
+def test_amake_http_request_retries_and_caches(monkeypatch, tmp_path):
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    calls = []
+
+    async def api(request):
+        # throttled with a 429 first, then answered
+        calls.append(dict(request.query))
+        if len(calls) == 1:
+            return web.Response(status=429, text="", headers={"Retry-After": "0"})
+        return web.json_response({"parse": {"title": request.query["page"]}})
+
+    app = web.Application()
+    app.router.add_get("/w/api.php", api)
+    cache = DiskCache(str(tmp_path))
+    monkeypatch.setattr(apiresult, "cache", cache)
+    monkeypatch.setattr(apiresult, "limiter", RateLimiter())
+
+    async def run():
+        async with TestServer(app) as server:
+            fullurl = str(server.make_url("/w/api.php?action=parse&page=x"))
+            try:
+                res, jsn = await apiresult.amake_http_request(fullurl, online=True)
+                asession = await apiresult._get_asession()
+                assert await apiresult._get_asession() is asession  # one per loop
+                # a second request is answered by the cache
+                _, jsn2 = await apiresult.amake_http_request(fullurl, online=True)
+            finally:
+                await apiresult.aclose()
+            assert asession.closed
+            return fullurl, res, jsn, jsn2
+
+    fullurl, res, jsn, jsn2 = asyncio.run(run())
+    assert jsn == jsn2 == {"parse": {"title": "x"}}
+    assert res.status_code == 200
+    assert len(calls) == 2 and calls[0]["maxlag"] == "5"
+    assert apiresult.limiter.metrics["retries"] == 1
+    assert json.loads(cache.get(fullurl)) == jsn
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eobjects import apiresult
+from eobjects.ratelimit import RateLimiter
+from eobjects.singleflight import SingleFlight, AsyncSingleFlight
+
+url = "https://en.wiktionary.org/w/api.php?action=parse&page=levare&prop=wikitext&formatversion=2&format=json"
+
+
+class SlowSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, fullurl, params=None):
+        self.calls += 1
+        time.sleep(0.2)
+        return apiresult.local_response(fullurl, json.dumps({"parse": {}}))
+
+
+def test_make_http_request_coalesces(monkeypatch):
+    session = SlowSession()
+    monkeypatch.setattr(apiresult, "session", session)
+    monkeypatch.setattr(apiresult, "cache", None)
+    monkeypatch.setattr(apiresult, "limiter", RateLimiter())
+    monkeypatch.setattr(apiresult, "flights", SingleFlight())
+    urls = [url + "#Latin", url, url + "#Old_Spanish", url]
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        results = list(pool.map(apiresult.make_http_request, urls))
+    assert session.calls == 1
+    assert apiresult.flights.shared == 3
+    # the one parsed json is shared
+    assert all(jsn is results[0][1] for _, jsn in results)
+
+
+def test_error_is_shared():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("down")
+
+    def follow():
+        started.wait()
+        return flights.do("k", lambda: "should not run")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "k", fail)
+        follower = pool.submit(follow)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flights.do("k", lambda: "next") == "next"  # a finished flight isn't reused
+
+
+def test_async_coalesces():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["page"] * 5
+    assert len(calls) == 1
+    assert flights.shared == 4
@@ -0,0 +1,129 @@
+import dill
+import mwparserfromhell as mwp
+import pytest
+
+import lexer
+import wikt_api as wx
+from eobjects import templatescan, mwparserhelper
+from eobjects.pagestore import PageStore
+from eobjects.templatescan import ScannedTemplate, Markup
+from tests.test_ import fetch_wikitext, graph_to_str
+from tests.test_domcache import MISSED_HEADING
+
+
+def test_template_params():
+    (template,) = templatescan.scan("{{inh|es|la|lēvāre|t=to [[raise]]|{{q|rare}}}}")
+    assert template.name == "inh"
+    assert [str(p) for p in template.params] == [
+        "es",
+        "la",
+        "lēvāre",
+        "t=to [[raise]]",
+        "{{q|rare}}",
+    ]
+    assert template.has("3") and not template.has("5")
+    assert str(template.get("t")) == "t=to [[raise]]"
+    assert repr(template.params) == repr(
+        mwp.parse(str(template)).filter_templates()[0].params
+    )
+    assert [t.name for t in templatescan.iter_templates(str(template))] == [
+        "inh",
+        "q",
+    ]
+
+
+def test_nodes():
+    nodes = list(
+        templatescan.scan(
+            "From {{m|la|plicō}}<ref>''Latin.''</ref>, [[fold]]. {{unclosed|x"
+        )
+    )
+    assert [type(node) for node in nodes] == [
+        str,
+        ScannedTemplate,
+        Markup,
+        str,
+        Markup,
+        str,
+    ]
+    assert nodes[-1] == ". {{unclosed|x"
+
+
+@pytest.mark.parametrize("topic", ["llevar", "llegar", "adelante"])
+def test_matches_mwparserfromhell(topic):
+    for sec in mwp.parse(fetch_wikitext(topic)).get_sections(flat=True):
+        assert [str(node) for node in templatescan.scan(str(sec))] == [
+            str(node) for node in sec.ifilter(recursive=False)
+        ]
+        assert [str(t) for t in templatescan.iter_templates(str(sec))] == [
+            str(t) for t in sec.ifilter_templates(recursive=True)
+        ]
+
+
+@pytest.mark.parametrize("redundance", [False, True])
+def test_split_sections_like_mwparserfromhell(redundance):
+    for topic in ["llevar", "llegar", "adelante", "wicked_abridged"]:
+        wikitext = fetch_wikitext(topic)
+        dom = mwp.parse(wikitext).get_sections(flat=not redundance)
+        assert mwparserhelper.split_sections(wikitext, redundance=redundance) == [
+            str(sec) for sec in dom
+        ]
+        assert [lexer.get_heading(str(sec)) for sec in dom] == [
+            lexer.get_heading(sec) for sec in dom
+        ]
+
+
+@pytest.mark.parametrize(
+    "topic, lang",
+    [
+        ("llevar", "Spanish"),
+        ("llegaron", "Spanish"),
+        ("adelante", "Spanish"),
+        ("plico", "Latin"),
+        ("prototype", "English"),
+    ],
+)
+def test_graph_from_raw_wikitext(topic, lang, tmp_path):
+    with open("assets/query_" + topic + "_" + lang + ".txt", "rb") as f:
+        _, (_, wikitext, _), _ = dill.load(f)
+    store = PageStore(str(tmp_path / "pages.sqlite"))
+    store.put_page(topic, wikitext)
+    wx.go_offline(store)
+    try:
+        G = wx.graph(wx.query(topic + "#" + lang))
+        Q = wx.query(topic + "#" + lang, raw=True)
+        assert Q.res is None and all(isinstance(sec, str) for sec in Q.dom)
+        assert all(
+            isinstance(entry.ety.wikicode, str) for entry in Q.entries if entry.ety
+        )
+        assert graph_to_str(wx.graph(Q)) == graph_to_str(G)
+        (Q2,) = wx.query_many([topic + "#" + lang], raw=True)
+        assert graph_to_str(wx.graph(Q2)) == graph_to_str(G)
+    finally:
+        wx.go_online()
+        store.close()
+
+
+def test_raw_query_distrusts_a_missed_heading(tmp_path):
+    store = PageStore(str(tmp_path / "pages.sqlite"))
+    store.put_page("verbo", MISSED_HEADING)
+    wx.go_offline(store)
+    try:
+        Q = wx.query("verbo#Spanish", raw=True)
+    finally:
+        wx.go_online()
+        store.close()
+    assert Q.langname == "Spanish"
+    text = "".join(Q.dom)
+    assert "verbum" in text and "enm" not in text
+
+
+def test_split_one_lang_distrusts_a_missed_subheading():
+    wikitext = "==Spanish==\n===Etymology===<!-- c -->\nFrom {{inh|es|la|verbum}}.\n"
+    assert mwparserhelper.split_sections(wikitext) == ["", wikitext]  # missed
+    dom, langname = mwparserhelper.split_one_lang(wikitext, "Spanish")
+    assert langname == "Spanish"
+    assert dom == [
+        "==Spanish==\n",
+        "===Etymology===<!-- c -->\nFrom {{inh|es|la|verbum}}.\n",
+    ]
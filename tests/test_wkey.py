@@ -1,3 +1,6 @@
+import pytest
+
+import queryutils
 from eobjects.wikikey import WikiKey
 
 
@@ -8,3 +11,14 @@ def test_wkey_from_url():
     )  # TODO implement resolve_multilang
     assert wkey.Lang.langname == "Spanish"
     print("h")
+
+
+def test_query_to_qparts_is_shared():
+    word, Lang, qflags = queryutils.query_to_qparts("plicō#Latin#2")
+    before = queryutils.query_to_qparts.cache_info()
+    assert queryutils.query_to_qparts("plicō#Latin#2") == (word, Lang, qflags)
+    assert queryutils.query_to_qparts("plicō#Latin#2")[1] is Lang
+    assert queryutils.query_to_qparts.cache_info().hits == before.hits + 2
+    assert (word, Lang.langname, qflags.def_id) == ("plicō", "Latin", 2)
+    with pytest.raises(AttributeError):
+        qflags.def_id = 1
@@ -1,4 +1,7 @@
+import asyncio
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import mwparserfromhell as mwp
 import requests
@@ -6,7 +9,7 @@ import requests
 import emulate.template2url
 import queryobjects
 import queryutils
-from eobjects import fixins
+from eobjects import fixins, batchfetch, templatescan, nodeindex
 from eobjects.wikikey import WikiKey
 from langhelper import Language
 from queryobjects import ThickQuery, DummyQuery
@@ -24,7 +27,7 @@ from typing import List, Dict, Union
 
 import mwparserfromhell
 
-# from mwparserfromhell.wikicode import Wikicode
+from mwparserfromhell.wikicode import Wikicode
 
 from etyobjects import (
     EtyRelation,
@@ -44,7 +47,8 @@ from eobjects.fixins import input
 """
 
 
-online = True  # TODO: online=False displays wrong versions of ety trees without throwing an exception
+# wikt_api.go_offline("pages.sqlite") answers every query from a local PageStore instead of Wiktionary
+from eobjects.apiresult import go_offline, go_online
 
 import os
 import builtins
@@ -71,12 +75,7 @@ def find_node_by_origin(G: nx.Graph, origin: Originator) -> Union[WordRelation,
     Returns the node that contains the originator; otherwise returns false
     """
 
-    retn = []
-    for node in G.nodes:
-        if isinstance(node, WordRelation):
-            node: WordRelation
-            if node.matches_query(origin.me):
-                retn.append(node)
+    retn = nodeindex.find_nodes(G, origin.me)
     if len(retn) == 0:
         warnings.warn("No matching node found for origin!")
         return None
@@ -88,18 +87,7 @@ def find_node_by_origin(G: nx.Graph, origin: Originator) -> Union[WordRelation,
 def find_node_by_query(
     GG: nx.DiGraph, query: str, warn=True
 ) -> Union[WordRelation, None]:
-    # _ = [print(x) for x in GG.nodes]
-    retn = []
-    for node in GG.nodes:
-        if isinstance(node, WordRelation):
-            node: WordRelation
-            if node.matches_query(query, warn=warn):
-                retn.append(node)
-        elif type(node) is Originator:
-            pass
-            # warnings.warn("Why is it matching the originator?")
-        else:
-            raise ValueError(f"node has unexpected type {type(node)}")
+    retn = nodeindex.find_nodes(GG, query, warn=warn)
     if len(retn) == 0:
         warnings.warn("No matching node found for query!")
         return None
@@ -114,7 +102,12 @@ def query(
     mimic_input=None,
     redundance=False,
     working_G: nx.DiGraph = None,
+    raw=False,
 ) -> Union[ThickQuery, List[str]]:
+    """
+    raw=True skips parsing a plaintext query's page: its sections stay wikitext, which graph() reads
+    with templatescan (see apiresult.parse_json()). Urls and WikiKeys come with their page already loaded.
+    """
 
     if not me:
         me = input(
@@ -126,34 +119,54 @@ def query(
         result = wkey.result
         me = wkey.me
     elif isinstance(me, str):
-        if (
-            me.startswith("http://")
-            or me.startswith("https://")
-            or me.startswith("en.wiktionary.org/wiki/")
-        ):
+        if is_url(me):
             wkey = WikiKey.from_regurl(me)  # build from a url
             result = wkey.result
             me = wkey.me  # turn the url into a standard string me
         else:
-            done = False  # build from a plaintext string
-            if working_G:
-                node = find_node_by_query(working_G, me, warn=False)
-                if node:
-                    wkey = WikiKey.from_node(node)
-                    if wkey:
-                        # word = wkey.word
-                        # biglang = wkey.Lang
-                        assert wkey.qflags is None
-                        wkey.qflags = queryutils.query_to_qparts(me, warn=False)[
-                            2
-                        ]  # merge query and node
-                        done = True
-            if not done:  # default condition
-                wkey = WikiKey.from_query(me, warn=False)  # we permit null langs here
+            wkey = wkey_from_query(me, working_G)  # build from a plaintext string
             result = wkey.load_result()  # this automatically throws on error
-            wkey.load_wikitext(infer_lang=True)  # right here is the lang inferral
+            wkey.load_wikitext(
+                infer_lang=True, raw=raw
+            )  # right here is the lang inferral
     else:
         raise TypeError(f"{me} has an unsupported type {type(me)}")
+    return query_from_result(wkey, result, me, query_id)
+
+
+def is_url(me: str) -> bool:
+    return (
+        me.startswith("http://")
+        or me.startswith("https://")
+        or me.startswith("en.wiktionary.org/wiki/")
+    )
+
+
+def wkey_from_query(me: str, working_G: nx.DiGraph = None) -> WikiKey:
+    """
+    Builds the (not yet loaded) WikiKey for a plaintext query, preferring a matching node of working_G.
+    """
+    if working_G:
+        node = find_node_by_query(working_G, me, warn=False)
+        if node:
+            wkey = WikiKey.from_node(node)
+            if wkey:
+                # word = wkey.word
+                # biglang = wkey.Lang
+                assert wkey.qflags is None
+                wkey.qflags = queryutils.query_to_qparts(me, warn=False)[
+                    2
+                ]  # merge query and node
+                return wkey
+    return WikiKey.from_query(me, warn=False)  # we permit null langs here
+
+
+def query_from_result(
+    wkey: WikiKey, result, me: str, query_id=0
+) -> Union[ThickQuery, DummyQuery]:
+    """
+    Wraps a WikiKey whose result and wikitext are loaded into the query object.
+    """
     # we take the word and lang and parse it into the corresponding wikilink
     # TODO: we don't know that the lang is Latin until after we load the page if we're autodetecting, and to load the page we need to know the word_urlify, and word_urlify must remove macrons
     # https://en.wiktionary.org/w/api.php?action=parse&page=word&prop=wikitext&formatversion=2&format=json
@@ -199,6 +212,97 @@ def query(
     )  # DID: transition this and ThickQuery to use Langs and thus to remember reconstr (DONE via WikiKey)
 
 
+async def aquery(
+    me: Union[str, WikiKey], query_id=0, working_G: nx.DiGraph = None
+) -> Union[ThickQuery, DummyQuery]:
+    """
+    Async counterpart of query(), so that one event loop can serve many queries at once.
+    The page is fetched with WikiKey.aload_result() and parsed in a worker thread.
+    Urls and preloaded WikiKeys are handed to query() in a worker thread as a whole.
+    There is no console input here, so me must not be blank.
+    """
+    if not me:
+        raise ValueError("aquery needs a query")
+    loop = asyncio.get_running_loop()
+    if isinstance(me, str) and not is_url(me):
+        wkey = wkey_from_query(me, working_G)
+        result = await wkey.aload_result()
+        await loop.run_in_executor(None, partial(wkey.load_wikitext, infer_lang=True))
+        return query_from_result(wkey, result, me, query_id)
+    return await loop.run_in_executor(
+        None, partial(query, me, query_id=query_id, working_G=working_G)
+    )
+
+
+def query_many(
+    queries: List[Union[str, WikiKey]],
+    max_workers=8,
+    query_id=0,
+    working_G: nx.DiGraph = None,
+    batch=True,
+    raw=False,
+) -> List[Union[ThickQuery, Exception]]:
+    """
+    Runs query() on each of queries concurrently, so that a batch is bound by Wiktionary rather than by latency.
+    With batch=True, the pages of plaintext queries are first fetched 50 to an api call (see batchfetch).
+    Results are returned in the same order as queries, and get the query_ids query_id, query_id + 1, ...
+    A failing query doesn't abort the batch; its exception is returned in its place.
+    Every query should specify its language, since lang inferral may ask for input.
+    With raw=True, pages aren't parsed at all, only graphed (see query()).
+    """
+    wkeys = [None] * len(queries)  # type: List[Union[WikiKey, Exception, None]]
+    if batch:
+        for i, me in enumerate(queries):
+            if isinstance(me, str) and me and not is_url(me):
+                try:
+                    wkeys[i] = wkey_from_query(me, working_G)
+                except Exception as e:
+                    wkeys[i] = e
+        prefetched = [(i, w) for i, w in enumerate(wkeys) if isinstance(w, WikiKey)]
+        errors = batchfetch.load_results([w for _, w in prefetched])
+        for (i, _), error in zip(prefetched, errors):
+            if error:
+                wkeys[i] = error
+
+    def _query(i, me):
+        wkey = wkeys[i]
+        if isinstance(wkey, Exception):
+            return wkey
+        try:
+            if wkey is None:
+                return query(me, query_id=query_id + i, working_G=working_G, raw=raw)
+            wkey.load_wikitext(infer_lang=True, raw=raw)
+            return query_from_result(wkey, wkey.result, me, query_id + i)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_query, range(len(queries)), queries))
+
+
+def top_nodes(code: Union[Wikicode, str]):
+    """
+    The top level nodes of a section. The raw wikitext of a query made with raw=True is read by templatescan instead,
+    so its graph is built without ever parsing the page into Wikicode.
+    """
+    if isinstance(code, str):
+        return templatescan.scan(code)
+    return code.ifilter(recursive=False)
+
+
+def all_templates(code: Union[Wikicode, str]):
+    """
+    Every template in a section, nested ones included. See top_nodes()
+    """
+    if isinstance(code, str):
+        return templatescan.iter_templates(code)
+    return code.ifilter_templates(recursive=True)
+
+
+def is_template(node) -> bool:
+    return isinstance(node, (mwp.wikicode.Template, templatescan.ScannedTemplate))
+
+
 def parse_and_graph(
     _Query,
     existent_node: EtyRelation = None,
@@ -206,7 +310,6 @@ def parse_and_graph(
     cog_lang_filter=None,
 ) -> nx.DiGraph:
     me, word, lang, def_id = _Query.query
-    dom = _Query.dom
     query_origin = _Query.origin
     biglang = _Query.biglang()
     existent_origin = (
@@ -232,6 +335,12 @@ def parse_and_graph(
         color = colors[node.o_id] if color is None else color
         G.add_node(node, id=node.o_id, color=color)
 
+    def add_edge(G, u, v):
+        # nodes are identified by value (see WordRelation.key), so a word can meet itself,
+        # ie. From {{inh|es|la|plicāre}}, from {{m|la|plicāre}}. That's one node, not a loop
+        if u != v:
+            G.add_edge(u, v)
+
     G = nx.DiGraph()
 
     if type(prev) is Originator and prev.o_id == 0:
@@ -251,10 +360,10 @@ def parse_and_graph(
                 origin=_Query.origin, template=None, query_opt=child + "#English"
             )
             add_node(G, dr)
-            G.add_edge(existent_origin, dr)
+            add_edge(G, existent_origin, dr)
         return G
 
-    entries = lexer.lex(dom)  # type: List[Entry]
+    entries = _Query.entries  # type: List[Entry]
     if len(entries) > 1:
         if def_id is None:
             def_id = input("Multiple definitions detected. Enter an ID: ")
@@ -288,11 +397,11 @@ def parse_and_graph(
 
         dotyet = False
         firstsentence = []
-        for node in ety.wikicode.ifilter(recursive=False):  # type: mwp.wikicode.Node
+        for node in top_nodes(ety.wikicode):  # type: mwp.wikicode.Node
             # .filter_templates(): #type: mwp.wikicode.Template
             # if etytemp
 
-            if isinstance(node, mwp.wikicode.Template):
+            if is_template(node):
                 etyr = EtyRelation(new_origin, node)
                 # print(str(etyr))
                 if not dotyet:
@@ -302,7 +411,8 @@ def parse_and_graph(
                 # print(str(node))
                 if not dotyet:  # if we're in the first sentence
                     if (
-                        isinstance(node, mwparserfromhell.wikicode.Text) and "." in node
+                        isinstance(node, (mwparserfromhell.wikicode.Text, str))
+                        and "." in node
                     ):  # if we reach the end
                         firstsentence.append(
                             node[: node.index(".") + 1]
@@ -345,13 +455,13 @@ def parse_and_graph(
                         parnt = next(iter(prevs_parents), (None, None))[1]
                         # parnt = prev2
                         add_node(G, token)
-                        G.add_edge(token, parnt)
+                        add_edge(G, token, parnt)
 
                         # sister node
                     else:
                         add_node(G, token)
                         if prev:
-                            G.add_edge(token, prev)
+                            add_edge(G, token, prev)
                     if make_mentions_sideways and is_in(
                         token.rtype, EtyRelation.sim_abbrs
                     ):
@@ -370,8 +480,8 @@ def parse_and_graph(
     for l3h in desc:
         descRs = []
         prevDR = None
-        for node in l3h.wikicode.ifilter(recursive=True):
-            if isinstance(node, mwp.wikicode.Template):
+        for node in all_templates(l3h.wikicode):
+            if is_template(node):
                 descR = DescentRelation(new_origin, node)
                 if descR:
                     if descR.rtype == "see desc":
@@ -396,8 +506,8 @@ def parse_and_graph(
         for token in descRs:
             add_node(G, token)
             # if prev: # it should
-            G.add_edge(
-                existent_origin, token
+            add_edge(
+                G, existent_origin, token
             )  # TODO: indention based on the level of indent in wiktionary
             if make_mentions_sideways and is_in(token.rtype, EtyRelation.sim_abbrs):
                 pass  # if a mention
@@ -411,8 +521,8 @@ def parse_and_graph(
         if defn.metainfo != "Definition":
             continue
         lemma_rels = []
-        for node in defn.wikicode.ifilter(recursive=False):
-            if isinstance(node, mwp.wikicode.Template):
+        for node in top_nodes(defn.wikicode):
+            if is_template(node):
                 node: mwp.wikicode.Template
                 templ_name = node.name
                 if templ_name[-3:] == " of":
@@ -432,7 +542,7 @@ def parse_and_graph(
                         # Start graphing
                         add_node(G, lemma_rel)
                         if prev:
-                            G.add_edge(lemma_rel, prev)
+                            add_edge(G, lemma_rel, prev)
                             # prev = lemma_rel
         # Basic methodology: detect if a template ends in " of", such as "past participle of"
         # lemma_flag = True